@@ -0,0 +1,32 @@
+import importlib
+
+# Each machine is imported from its module the first time it is looked up, so
+# importing the package only pays for the ciphers that are actually used.
+_MACHINES = {
+    "ADFGX": "adfgx",
+    "Autokey": "autokey",
+    "CipherMachine": "cipher_machine",
+    "Columnar": "columnar",
+    "Monoalphabetic": "monoalphabetic",
+    "OTP": "otp",
+    "Playfair": "playfair",
+    "Polybius": "polybius",
+    "Railfence": "railfence",
+    "Shift": "shift",
+    "Vigenere": "vigenere",
+}
+
+__all__ = list(_MACHINES)
+
+
+def __getattr__(name):
+    if name not in _MACHINES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{_MACHINES[name]}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
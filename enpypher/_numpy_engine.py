@@ -0,0 +1,131 @@
+"""Vectorised inner loops for machines whose engine is set to "numpy".
+
+Text is turned into an array of code points once, the letters are looked up as
+indices into the alphabet, and the cipher is applied to all of them at once
+before the array is turned back into text.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+
+def shift(
+    text: str, alpha: str, key: str, encipher: bool, j: int
+) -> Tuple[str, int]:
+    """Shift each letter by the next letter of a repeating key, j being how
+    many letters of the key have been used so far."""
+    codes = _codes(text)
+    idx = _index(codes, alpha)
+    mask = idx >= 0
+    letters = idx[mask]
+    if not len(letters):
+        return text, j
+    if not key:
+        raise ValueError("the key has no letters from the alphabet")
+
+    shifts = np.roll(_index(_codes(key), alpha), -(j % len(key)))
+    return (
+        _apply(
+            codes,
+            mask,
+            letters,
+            np.resize(shifts, len(letters)),
+            alpha,
+            encipher,
+        ),
+        j + len(letters),
+    )
+
+
+def autokey_encipher(text: str, alpha: str, running: str) -> Tuple[str, str]:
+    """Encipher with a running key which is followed by the plaintext itself,
+    returning the text and the letters the running key continues with."""
+    codes = _codes(text)
+    idx = _index(codes, alpha)
+    mask = idx >= 0
+    letters = idx[mask]
+    if not len(letters):
+        return text, running
+
+    stream = np.concatenate([_index(_codes(running), alpha), letters])
+    return (
+        _apply(codes, mask, letters, stream[: len(letters)], alpha, True),
+        _text(_codes(alpha)[stream[len(letters) :]]),
+    )
+
+
+def autokey_decipher(text: str, alpha: str, running: str) -> Tuple[str, str]:
+    """Decipher with a running key which is followed by the plaintext, as an
+    alternating sum down each of the len(running) lanes of letters."""
+    codes = _codes(text)
+    idx = _index(codes, alpha)
+    mask = idx >= 0
+    letters = idx[mask].astype(np.int64)
+    if not len(letters):
+        return text, running
+
+    # Each column of the grid is a lane, started off by one running letter.
+    k = len(running)
+    starts = _index(_codes(running), alpha).astype(np.int64)
+    grid = np.zeros(-(-len(letters) // k) * k, dtype=np.int64)
+    grid[: len(letters)] = letters
+    grid = grid.reshape(-1, k)
+    signs = np.where(np.arange(len(grid)) % 2, -1, 1)[:, None]
+    plain = signs * (np.cumsum(signs * grid, axis=0) - starts) % len(alpha)
+    plain = plain.reshape(-1)[: len(letters)]
+
+    stream = np.concatenate([starts, plain])
+    new_codes = codes.copy()
+    new_codes[mask] = _codes(alpha)[plain]
+    return _text(new_codes), _text(_codes(alpha)[stream[len(letters) :]])
+
+
+def polybius(text: str, square: str, size: int) -> str:
+    """Replace every letter with its row and column in a square of the given
+    size, which must leave both as single digits."""
+    codes = _codes(text)
+    idx = _index(codes, square)
+    mask = idx >= 0
+
+    # Letters take two places in the new text and everything else one.
+    ends = np.cumsum(mask + 1)
+    starts = ends - (mask + 1)
+    new_codes = np.empty(ends[-1] if len(ends) else 0, dtype=np.uint32)
+    new_codes[starts[~mask]] = codes[~mask]
+    letters = idx[mask]
+    new_codes[starts[mask]] = ord("1") + letters // size
+    new_codes[starts[mask] + 1] = ord("1") + letters % size
+    return _text(new_codes)
+
+
+def _apply(codes, mask, letters, shifts, alpha, encipher) -> str:
+    shifted = (letters + shifts if encipher else letters - shifts) % len(alpha)
+    new_codes = codes.copy()
+    new_codes[mask] = _codes(alpha)[shifted]
+    return _text(new_codes)
+
+
+def _codes(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+
+
+def _text(codes: np.ndarray) -> str:
+    return codes.astype("<u4", copy=False).tobytes().decode("utf-32-le")
+
+
+@lru_cache(maxsize=64)
+def _index_table(alpha: str) -> np.ndarray:
+    # The position in the alphabet of every code point up to its largest, or
+    # -1, with a last slot standing in for all the larger code points.
+    points = _codes(alpha)
+    table = np.full(int(points.max(initial=0)) + 2, -1, dtype=np.int32)
+    table[points] = np.arange(len(points), dtype=np.int32)
+    table.flags.writeable = False
+    return table
+
+
+def _index(codes: np.ndarray, alpha: str) -> np.ndarray:
+    table = _index_table(alpha)
+    return table[np.minimum(codes, len(table) - 1)]
@@ -1,7 +1,5 @@
 import string
 
-from bidict import bidict
-
 from enpypher.cipher_machine import CipherMachine
 from enpypher.columnar import Columnar
 from enpypher.polybius import Polybius
@@ -20,8 +18,8 @@ class ADFGX(CipherMachine):
     def _cipher(self, text: str, encipher: bool) -> str:
         if encipher:
             text = self._prepare_pt(text)
-
-        text = text.upper()
+        else:
+            text = text.upper()
 
         pb = Polybius(self.grid_key, 5, self.alpha)
 
@@ -30,7 +28,6 @@ class ADFGX(CipherMachine):
         else:
             col_alpha = self.alpha
         c = Columnar(self.trans_key, col_alpha)
-        print(c.col_map)
 
         if encipher:
             text = pb.encipher(text)
@@ -71,6 +68,8 @@ class ADFGX(CipherMachine):
         return pt
 
     def set_key(self, grid_key, trans_key) -> None:
+        from bidict import bidict
+
         self.grid_key = grid_key
         self.trans_key = trans_key
         self.mapping = bidict(
@@ -1,5 +1,11 @@
 import string
+from collections import deque
+from itertools import accumulate, repeat
+from operator import mod, neg
+from typing import List, Optional, Tuple
 
+from enpypher import vigenere
+from enpypher.cipher_machine import CipherMachine
 from enpypher.vigenere import Vigenere
 
 
@@ -22,29 +28,136 @@ class Autokey(Vigenere):
         """
         super().__init__(key, alpha)
 
-    def encipher(self, pt: str) -> str:
-        self.clean_key, temp = (
-            self.clean_key + self._clean_input(pt, alpha=self.alpha),
-            self.clean_key,
-        )
-        ct = super().encipher(pt)
-        self.clean_key = temp
-        return ct
-
-    def decipher(self, ct: str) -> str:
-        ct = ct.upper()
-        pt = []
-        key = list(self.clean_key)
-        j = 0
-        for char in ct:
+    @classmethod
+    def crack(
+        cls, ct: str, max_length: int = 20, workers: Optional[int] = None
+    ) -> Tuple[List[Tuple[str, float]], "Autokey"]:
+        """Recover the primer of an English ciphertext. Each letter of the
+        primer decides every len(primer)th letter of the plaintext, so each
+        primer length is solved one letter at a time, by letter frequencies
+        and then by quadgrams.
+
+        Args:
+            ct (str): The ciphertext.
+            max_length (int, optional): The longest primer tried. Defaults to 20.
+            workers (int, optional): The number of processes to share the
+                primer lengths between. Defaults to None, trying them all in
+                this process.
+
+        Returns:
+            Tuple[List[Tuple[str, float]], Autokey]: Each primer found with its
+                quadgram score per letter, best first, and a machine set up
+                with the best of them.
+        """
+        from enpypher.solve import autokey
+
+        return autokey.crack(ct, max_length, workers)
+
+    def _cipher(self, text, encipher):
+        return "".join(self._stream([text], encipher))
+
+    def _stream(self, chunks, encipher):
+        # The running key only ever needs the next len(key) letters: each
+        # letter used is replaced by the plaintext letter it produced.
+        running = deque(self.clean_key)
+        for chunk in self._prepare_chunks(chunks, encipher):
+            yield self._run(chunk, encipher, running)
+
+    def _cipher_batch(self, texts, encipher):
+        # The running key carries the plaintext along, so every message has
+        # to be ciphered on its own.
+        return CipherMachine._cipher_batch(self, texts, encipher)
+
+    def _cipher_bytes(self, data, encipher):
+        return b"".join(self._stream_bytes([data], encipher))
+
+    def _stream_bytes(self, blocks, encipher):
+        if not self.alpha.isascii():
+            raise ValueError("bytes need an ASCII alphabet")
+        # Bytes outside of ASCII decode to characters outside of the
+        # alphabet, which the running key passes over.
+        running = deque(self.clean_key)
+        for block in blocks:
+            if isinstance(block, str):
+                text = self._prepare_text(block, encipher)
+                yield self._run(text, encipher, running)
+            else:
+                text = self._prepare_bytes(block, encipher).decode("latin-1")
+                yield self._run(text, encipher, running).encode("latin-1")
+
+    def _run(self, text: str, encipher: bool, running: deque) -> str:
+        if self.engine == "numpy":
+            from enpypher import _numpy_engine
+
+            run = (
+                _numpy_engine.autokey_encipher
+                if encipher
+                else _numpy_engine.autokey_decipher
+            )
+            text, rest = run(text, self.alpha, "".join(running))
+            running.clear()
+            running.extend(rest)
+            return text
+        if (
+            not encipher
+            and running
+            and len(text) >= vigenere._STRIDED_MIN_LENGTH
+            and len(self.alpha) <= 256
+        ):
+            return self._run_lanes(text, running)
+
+        direc = 1 if encipher else -1
+        new_text = []
+        for char in text:
             if char in self.idx:
-                key_let = key[j % len(key)]
-                pt_char = self.alpha[
-                    (self.idx[char] - self.idx[key_let]) % len(self.alpha)
+                if encipher:
+                    running.append(char)
+                new_char = self.alpha[
+                    (self.idx[char] + direc * self.idx[running.popleft()])
+                    % len(self.alpha)
                 ]
-                pt.append(pt_char)
-                key.append(pt_char)
-                j += 1
+                if not encipher:
+                    running.append(new_char)
+                new_text.append(new_char)
             else:
-                pt.append(char)
-        return "".join(pt).lower()
+                new_text.append(char)
+        return "".join(new_text)
+
+    def set_alpha(self, alpha):
+        super().set_alpha(alpha)
+        indices = "".join(map(chr, range(len(self.alpha))))
+        self._to_index = str.maketrans(self.alpha, indices)
+        self._from_index = str.maketrans(indices, self.alpha)
+
+    def _run_lanes(self, text: str, running: deque) -> str:
+        # Deciphering, each plaintext letter is the ciphertext letter less the
+        # plaintext letter len(key) before it, so every len(key)th letter
+        # forms a lane of its own. Along a lane the plaintext is an
+        # alternating sum of the ciphertext, less or plus the key letter that
+        # starts it, which is worked out with a running total.
+        parts = self._non_alpha_runs.split(text)
+        letters = "".join(parts[::2])
+        if not letters:
+            return text
+
+        # Letters become indices, and back, through one byte each.
+        cipher = list(letters.translate(self._to_index).encode("latin-1"))
+        k = len(running)
+        plain = [0] * len(cipher)
+        for r, start in zip(range(len(cipher)), running):
+            lane = cipher[r::k]
+            lane[1::2] = map(neg, lane[1::2])
+            lane[0] -= self.idx[start]
+            sums = list(accumulate(lane))
+            sums[1::2] = map(neg, sums[1::2])
+            plain[r::k] = sums
+
+        plain = (
+            bytes(map(mod, plain, repeat(len(self.alpha))))
+            .decode("latin-1")
+            .translate(self._from_index)
+        )
+        running.extend(plain[-k:])
+        for _ in range(min(k, len(plain))):
+            running.popleft()
+        return self._merge_letters(parts, plain)
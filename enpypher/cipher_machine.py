@@ -1,45 +1,379 @@
+import codecs
+import mmap
+import os
 import re
 import string
+import sys
 import unicodedata
 from abc import ABC, abstractmethod
-from typing import List
-
-from num2words import num2words
+from array import array
+from collections import Counter
+from functools import lru_cache
+from itertools import repeat
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import enpypher.constants as constants
 
+# Files are read and written this many bytes at a time.
+_FILE_BLOCK_SIZE = 1 << 20
+
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+# Joins batches of messages for ciphers which leave it untouched.
+_BATCH_SEPARATOR = "\x00"
+
+# Each worker process is handed its share of a batch in this many pieces.
+_SHARDS_PER_WORKER = 4
+
+# Transpositions work on text that isn't ASCII as an array of code points.
+_UTF32 = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+
+class TextStats(NamedTuple):
+    """Letter statistics of a text, as found by CipherMachine.stats."""
+
+    ic: float
+    histogram: Dict[str, int]
+    window_ic: List[float]
+
 
 class CipherMachine(ABC):
+    # Engines this cipher can be run with, and the one in use.
+    _engines = ("python",)
+    engine = "python"
+
     def __init__(self, key, alpha=string.ascii_uppercase):
         self.set_alpha(alpha)
         self.set_key(key)
 
-    def encipher(self, pt: str) -> str:
+    def encipher(self, pt):
         """Encipher the given plaintext with the cipher and current key.
 
+        Ciphers which substitute one letter at a time also accept bytes,
+        bytearray or memoryview plaintext. It is treated as ASCII text, bytes
+        outside of ASCII are left as they are, and the ciphertext is returned
+        as the same type.
+
         Args:
-            pt (str): The plaintext to be enciphered.
+            pt (str | bytes | bytearray | memoryview): The plaintext to be enciphered.
 
         Returns:
-            str: The enciphered text.
+            str | bytes | bytearray | memoryview: The enciphered text.
         """
+        if isinstance(pt, _BYTES_TYPES):
+            return self._like(pt, self._cipher_bytes(bytes(pt), True).upper())
         return self._cipher(pt, True).upper()
 
-    def decipher(self, ct: str) -> str:
+    def decipher(self, ct):
         """Decipher the given ciphertext with the cipher and current key.
 
+        Ciphers which substitute one letter at a time also accept bytes,
+        bytearray or memoryview ciphertext. It is treated as ASCII text, bytes
+        outside of ASCII are left as they are, and the plaintext is returned
+        as the same type.
+
         Args:
-            pt (str): The ciphertext to be deciphered.
+            ct (str | bytes | bytearray | memoryview): The ciphertext to be deciphered.
 
         Returns:
-            str: The deciphered text.
+            str | bytes | bytearray | memoryview: The deciphered text.
         """
+        if isinstance(ct, _BYTES_TYPES):
+            return self._like(ct, self._cipher_bytes(bytes(ct), False).lower())
         return self._cipher(ct, False).lower()
 
+    def stream_encipher(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Encipher plaintext supplied in pieces, lazily yielding the ciphertext
+        in pieces. The state of the cipher is carried across chunk boundaries,
+        so the joined output is the same as enciphering the joined input.
+
+        Args:
+            chunks (Iterable[str]): The plaintext to be enciphered, in pieces.
+
+        Yields:
+            str: The enciphered text, in pieces.
+        """
+        for chunk in self._stream(chunks, True):
+            if chunk:
+                yield chunk.upper()
+
+    def stream_decipher(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Decipher ciphertext supplied in pieces, lazily yielding the plaintext
+        in pieces. The state of the cipher is carried across chunk boundaries,
+        so the joined output is the same as deciphering the joined input.
+
+        Args:
+            chunks (Iterable[str]): The ciphertext to be deciphered, in pieces.
+
+        Yields:
+            str: The deciphered text, in pieces.
+        """
+        for chunk in self._stream(chunks, False):
+            if chunk:
+                yield chunk.lower()
+
+    def encipher_many(
+        self, texts: Iterable[str], workers: Optional[int] = None
+    ) -> List[str]:
+        """Encipher many messages with the current key. The Shift,
+        Monoalphabetic and Vigenère ciphers, and the Polybius square when its
+        alphabet has digits, encipher the messages together in a single pass;
+        the others encipher them one at a time.
+
+        Args:
+            texts (Iterable[str]): The plaintexts to be enciphered.
+            workers (int, optional): The number of processes to share the
+                messages between. Defaults to None, enciphering them all in
+                this process.
+
+        Raises:
+            TypeError: The one time pad cannot reuse its key, so it cannot
+                encipher many messages.
+
+        Returns:
+            List[str]: The enciphered texts, in the same order.
+        """
+        return self._cipher_many(list(texts), True, workers)
+
+    def decipher_many(
+        self, texts: Iterable[str], workers: Optional[int] = None
+    ) -> List[str]:
+        """Decipher many messages with the current key. The Shift,
+        Monoalphabetic and Vigenère ciphers decipher the messages together in
+        a single pass; the others decipher them one at a time.
+
+        Args:
+            texts (Iterable[str]): The ciphertexts to be deciphered.
+            workers (int, optional): The number of processes to share the
+                messages between. Defaults to None, deciphering them all in
+                this process.
+
+        Returns:
+            List[str]: The deciphered texts, in the same order.
+        """
+        return self._cipher_many(list(texts), False, workers)
+
+    def encipher_file(
+        self,
+        src_path: Union[str, os.PathLike],
+        dst_path: Union[str, os.PathLike],
+        encoding="utf-8",
+    ) -> None:
+        """Encipher the contents of one file into another. The source file is
+        memory-mapped and processed in blocks, so it is never held in memory
+        as a whole.
+
+        Args:
+            src_path (str | os.PathLike): The file holding the plaintext.
+            dst_path (str | os.PathLike): The file to write the ciphertext to.
+            encoding (str, optional): The encoding of both files. Defaults to "utf-8".
+        """
+        self._cipher_file(src_path, dst_path, True, encoding)
+
+    def decipher_file(
+        self,
+        src_path: Union[str, os.PathLike],
+        dst_path: Union[str, os.PathLike],
+        encoding="utf-8",
+    ) -> None:
+        """Decipher the contents of one file into another. The source file is
+        memory-mapped and processed in blocks, so it is never held in memory
+        as a whole.
+
+        Args:
+            src_path (str | os.PathLike): The file holding the ciphertext.
+            dst_path (str | os.PathLike): The file to write the plaintext to.
+            encoding (str, optional): The encoding of both files. Defaults to "utf-8".
+        """
+        self._cipher_file(src_path, dst_path, False, encoding)
+
     @abstractmethod
     def _cipher(self, text: str, encipher: bool) -> str:
         pass
 
+    def _joinable(self, encipher: bool) -> bool:
+        """Whether every character is ciphered on its own, so that messages
+        can be joined, ciphered in one go and split apart again."""
+        return False
+
+    def _cipher_many(self, texts, encipher, workers):
+        if workers is None or workers < 2 or len(texts) < 2:
+            return self._cipher_batch(texts, encipher)
+
+        size = -(-len(texts) // (workers * _SHARDS_PER_WORKER))
+        shards = [texts[i : i + size] for i in range(0, len(texts), size)]
+        # Imported here as it takes a while and is only needed for batches.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as pool:
+            results = pool.map(self._cipher_batch, shards, repeat(encipher))
+            return [text for shard in results for text in shard]
+
+    def _cipher_batch(self, texts: List[str], encipher: bool) -> List[str]:
+        cipher = self.encipher if encipher else self.decipher
+        if self._joinable(encipher) and not any(
+            _BATCH_SEPARATOR in text for text in texts
+        ):
+            # The separator is a control character, which is kept by the
+            # cleaning and left alone by the cipher.
+            results = cipher(_BATCH_SEPARATOR.join(texts)).split(
+                _BATCH_SEPARATOR
+            )
+            if len(results) == len(texts):
+                return results
+        return [cipher(text) for text in texts]
+
+    def _cipher_bytes(self, data: bytes, encipher: bool) -> bytes:
+        raise TypeError(f"{type(self).__name__} can't cipher bytes")
+
+    def _stream_bytes(
+        self, blocks: Iterable[Union[bytes, str]], encipher: bool
+    ) -> Iterator[Union[bytes, str]]:
+        # Files hand over the parts that aren't ASCII already decoded, to be
+        # ciphered as text along with the bytes around them.
+        for block in blocks:
+            if isinstance(block, str):
+                yield self._cipher(block, encipher)
+            else:
+                yield self._cipher_bytes(block, encipher)
+
+    def _can_cipher_bytes(self, encipher: bool) -> bool:
+        """Whether _stream_bytes can cipher ASCII text with the current key and
+        alphabet, so that ASCII files can skip decoding."""
+        return False
+
+    @staticmethod
+    def _like(data, result: bytes):
+        # Returns result as the same type of bytes-like object as data.
+        if isinstance(data, bytearray):
+            return bytearray(result)
+        if isinstance(data, memoryview):
+            return memoryview(result)
+        return result
+
+    def _byte_table(self, encipher: bool) -> Optional[Tuple[bytes, bytes]]:
+        """Arguments for bytes.translate taking ASCII text straight to its
+        output, for ciphers which substitute one character at a time.
+
+        Returns:
+            Optional[Tuple[bytes, bytes]]: The table and the bytes to delete, or
+                None if the cipher can't be expressed as a byte translation.
+        """
+        return None
+
+    def _ascii_table(self, encipher: bool) -> Optional[Tuple[bytes, bytes]]:
+        # Builds a _byte_table by running each ASCII character through the
+        # cipher on its own.
+        table = bytearray(range(128)) + bytes(range(128, 256))
+        delete = bytearray()
+        for code_point in range(128):
+            char = chr(code_point)
+            out = self.encipher(char) if encipher else self.decipher(char)
+            if out == "":
+                delete.append(code_point)
+            elif len(out) == 1 and out.isascii():
+                table[code_point] = ord(out)
+            else:
+                return None
+        return bytes(table), bytes(delete)
+
+    def _cipher_file(self, src_path, dst_path, encipher, encoding):
+        case = str.upper if encipher else str.lower
+        decoder = codecs.getincrementaldecoder(encoding)()
+        with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+            blocks = self._read_blocks(src)
+            if codecs.lookup(encoding).name not in (
+                "utf-8",
+                "ascii",
+            ) or not self._can_cipher_bytes(encipher):
+                chunks = self._decode_blocks(blocks, decoder)
+                for chunk in self._stream(chunks, encipher):
+                    dst.write(case(chunk).encode(encoding))
+                return
+
+            # ASCII blocks skip decoding entirely. A character split between
+            # two blocks always makes the second block non-ASCII, so it is
+            # finished by the decoder.
+            parts = self._ascii_or_decoded(blocks, decoder)
+            table = self._byte_table(encipher)
+            if table is None:
+                parts = self._stream_bytes(parts, encipher)
+            else:
+                # Substitutions carry no state, so each part is ciphered on
+                # its own.
+                parts = (
+                    (
+                        part.translate(*table)
+                        if isinstance(part, bytes)
+                        else self._cipher(part, encipher)
+                    )
+                    for part in parts
+                )
+            for part in parts:
+                if isinstance(part, str):
+                    dst.write(case(part).encode(encoding))
+                elif table is None:
+                    dst.write(part.upper() if encipher else part.lower())
+                else:
+                    dst.write(part)
+
+    @staticmethod
+    def _ascii_or_decoded(
+        blocks: Iterable[bytes], decoder
+    ) -> Iterator[Union[bytes, str]]:
+        # Each block as it is if it's ASCII, and decoded otherwise.
+        for block in blocks:
+            yield block if block.isascii() else decoder.decode(block)
+        yield decoder.decode(b"", final=True)
+
+    @staticmethod
+    def _read_blocks(file) -> Iterator[bytes]:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            # Empty files can't be memory-mapped.
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, size, _FILE_BLOCK_SIZE):
+                yield mapped[start : start + _FILE_BLOCK_SIZE]
+
+    @staticmethod
+    def _decode_blocks(blocks: Iterable[bytes], decoder) -> Iterator[str]:
+        for block in blocks:
+            yield decoder.decode(block)
+        yield decoder.decode(b"", final=True)
+
+    @staticmethod
+    def _code_units(
+        text: str,
+    ) -> Tuple[Union[bytes, array], Union[bytearray, array]]:
+        # The characters of a text in a form slices can be copied between,
+        # bytes for ASCII text and an array of code points otherwise, with a
+        # blank one of the same length to copy them into.
+        if text.isascii():
+            return text.encode("ascii"), bytearray(len(text))
+        units = array("I", text.encode(_UTF32))
+        return units, array("I", bytes(units.itemsize * len(units)))
+
+    @staticmethod
+    def _from_code_units(units: Union[bytearray, array]) -> str:
+        if isinstance(units, bytearray):
+            return units.decode("ascii")
+        return units.tobytes().decode(_UTF32)
+
+    def _stream(self, chunks: Iterable[str], encipher: bool) -> Iterator[str]:
+        # Transpositions need the length of the whole text before anything
+        # can be written, so by default the chunks are gathered first.
+        yield self._cipher("".join(chunks), encipher)
+
     @abstractmethod
     def set_key(self, key: str) -> None:
         """Sets a new key for the cipher.
@@ -68,6 +402,21 @@ class CipherMachine(ABC):
             )
         )
 
+    def set_engine(self, engine: str) -> None:
+        """Choose how the cipher does its work. The "numpy" engine, offered by
+        the Vigenère family and the Polybius square, works on whole arrays of
+        letters at once and gives exactly the same results as the default
+        "python" engine.
+
+        Args:
+            engine (str): "python", or "numpy" if NumPy is installed.
+        """
+        if engine not in self._engines:
+            raise ValueError(f"{type(self).__name__} has no {engine!r} engine")
+        if engine == "numpy":
+            import enpypher._numpy_engine  # noqa: F401
+        self.engine = engine
+
     def alphabet(self) -> str:
         """Return the plaintext alphabet currently being used by the cipher.
 
@@ -77,78 +426,130 @@ class CipherMachine(ABC):
         return self.alpha
 
     def findIC(self, text: str) -> float:
+        """Find the index of coincidence of the alphabet letters in a text,
+        normalised by the size of the alphabet.
+
+        Args:
+            text (str): The text to measure.
+
+        Returns:
+            float: The index of coincidence, or 0 if the text has fewer than
+                two letters.
+        """
+        return self.stats(text).ic
+
+    def stats(self, text: str, window: Optional[int] = None) -> "TextStats":
+        """Count the alphabet letters in a text in a single pass.
+
+        Args:
+            text (str): The text to measure.
+            window (int, optional): The number of letters in each window of
+                the sliding index of coincidence. Defaults to None, which
+                leaves the series empty.
+
+        Returns:
+            TextStats: The index of coincidence, the count of each letter and
+                the index of coincidence of every window of letters.
+        """
         text = self._clean_input(text, alpha=self.alpha)
-        phio = 0
-        for letter in self.alpha:
-            freq = text.count(letter)
-            phio += freq * (freq - 1)
-        length = len(text)
-        comp = length * (length - 1)
-        return 26 * phio / comp
+        counts = Counter(text)
+        histogram = {letter: counts[letter] for letter in self.alpha}
+        return TextStats(
+            _ic(histogram.values(), len(text), len(self.alpha)),
+            histogram,
+            [] if window is None else self._windowed_ic(text, window),
+        )
+
+    def _windowed_ic(self, text: str, window: int) -> List[float]:
+        if window < 2:
+            raise ValueError("window must hold at least two letters")
+        if len(text) < window:
+            return []
+
+        # Each step adds one letter and drops another, changing the sum of
+        # f * (f - 1) by twice the count of the letter before it moved.
+        counts = Counter(text[:window])
+        phio = sum(freq * (freq - 1) for freq in counts.values())
+        scale = len(self.alpha) / (window * (window - 1))
+        series = [phio * scale]
+        for new, old in zip(text[window:], text):
+            phio += 2 * (counts[new] - counts[old] + 1) - 2 * (new == old)
+            counts[new] += 1
+            counts[old] -= 1
+            series.append(phio * scale)
+        return series
 
     # -----------------------------Private-------------------------------- #
     @classmethod
     def __conv_num(cls, text):
-        text_list = re.split("(\d+)", text)
-        i = 0
-        while i < len(text_list):
-            if text_list[i].isdecimal():
-                num = text_list[i]
-                while True:
-                    if (
-                        i + 1 < len(text_list)
-                        and text_list[i + 1].isdecimal()
-                        or (
-                            i + 2 < len(text_list)
-                            and text_list[i + 1] == "."
-                            and text_list[i + 2].isdecimal()
-                        )
-                    ):
-                        num += text_list[i + 1]
-                        text_list.pop(i + 1)
-                    elif i + 1 < len(text_list) and text_list[i + 1] == ",":
-                        text_list.pop(i + 1)
-                    else:
-                        break
-                text_list[i] = num
-            i += 1
-
-        for i in range(len(text_list)):
-            if text_list[i] != "" and text_list[i][0].isdecimal():
-                before = text_list[i - 1]
-                isYear = False
-                for phrase in constants._WORDS_BEFORE_YEAR:
-                    if phrase.upper() in before.upper():
-                        isYear = True
-                        break
-                if isYear:
-                    text_list[i] = num2words(text_list[i], to="year")
-                    continue
-
-                before = text_list[i - 1].split(" ")
-                after = (
-                    text_list[i + 1].split(" ")
-                    if i < len(text_list) - 1
-                    else None
+        return "".join(cls.__conv_num_segments(text))
+
+    @classmethod
+    def __conv_num_part(cls, text: str, lead: str) -> Tuple[str, str]:
+        """Convert the numbers in one piece of a longer text.
+
+        Args:
+            text (str): The piece to convert. Unless it is the last piece it
+                must end with whitespace, so no word straddles two pieces.
+            lead (str): The context returned for the previous piece.
+
+        Returns:
+            Tuple[str, str]: The converted piece and the context for the next one.
+        """
+        segments = cls.__conv_num_segments(lead + text)
+        converted = "".join(segments)[len(lead) :]
+
+        # Years are recognised by phrases anywhere in the text since the last
+        # number, so only whether a phrase has been seen, or the last few
+        # characters in case one is about to, has to be carried forward.
+        tail = segments[-1]
+        found = _year_phrases().search(tail.upper())
+        if found:
+            return converted, found.group() + " "
+        longest = max(map(len, constants._WORDS_BEFORE_YEAR))
+        return converted, tail[-longest:]
+
+    @classmethod
+    def __conv_num_segments(cls, text: str) -> List[str]:
+        # Splits text into alternating non-number and number segments,
+        # converting the numbers and any currency symbols next to them.
+        text_list = []
+        start = 0
+        for match in _NUMBER.finditer(text):
+            text_list.append(text[start : match.start()])
+            text_list.append(match.group(1).replace(",", ""))
+            start = match.end()
+        # A comma ending the text is dropped along with the segment after it.
+        if start < len(text) or not text.endswith(","):
+            text_list.append(text[start:])
+
+        year_phrases = _year_phrases()
+        for i in range(1, len(text_list), 2):
+            if year_phrases.search(text_list[i - 1].upper()):
+                text_list[i] = _num_words(text_list[i], "year")
+                continue
+
+            head, sep, word = text_list[i - 1].rpartition(" ")
+            if i + 1 < len(text_list):
+                first, _, rest = text_list[i + 1].partition(" ")
+            else:
+                first = rest = None
+            if word in constants._CURRENCY:
+                text_list[i - 1] = head + sep + constants._CURRENCY[word] + " "
+                text_list[i] = _num_words(text_list[i])
+            elif first is not None and first in constants._CURRENCY:
+                text_list[i - 1] = (
+                    head + sep + constants._CURRENCY[first] + " "
                 )
-                if before[-1] in constants._CURRENCY:
-                    before[-1] = constants._CURRENCY[before[-1]] + " "
-                    text_list[i - 1] = " ".join(before)
-                    text_list[i] = num2words(text_list[i])
-                elif after is not None and after[0] in constants._CURRENCY:
-                    before[-1] = constants._CURRENCY[after[0]] + " "
-                    text_list[i - 1] = " ".join(before)
-                    text_list[i + 1] = " ".join(after[1:])
-                    text_list[i] = num2words(text_list[i])
-                elif (
-                    after is not None and after[0][:2] in constants._ORD_SUFFIX
-                ):
-                    text_list[i + 1] = " " + " ".join(after[1:])
-                    text_list[i] = num2words(text_list[i], to="ordinal")
-                else:
-                    text_list[i] = num2words(text_list[i])
+                text_list[i + 1] = rest
+                text_list[i] = _num_words(text_list[i])
+            elif first is not None and first[:2] in constants._ORD_SUFFIX:
+                text_list[i + 1] = " " + rest
+                text_list[i] = _num_words(text_list[i], "ordinal")
+            else:
+                text_list[i] = _num_words(text_list[i])
 
-        return "".join(text_list)
+        return text_list
 
     @classmethod
     def __conv_units(cls, text):
@@ -188,49 +589,120 @@ class CipherMachine(ABC):
         Returns:
             str: The cleaned text.
         """
-        text = text.upper()
-
-        if not accent:
-            normal = unicodedata.normalize("NFD", text)
-            text = "".join(c for c in normal if not unicodedata.combining(c))
-
-        if alpha != "":
-            return "".join([char for char in text if char in alpha])
+        plan = _cleaning_plan(
+            space,
+            punc,
+            accent,
+            num,
+            conv_num,
+            conv_units,
+            other,
+            conv_other,
+            alpha,
+        )
+        if not plan.staged:
+            return text.translate(plan.table)
 
-        if not num:
-            for char in string.digits:
-                text = text.replace(char, "")
-        elif conv_num:
+        text = text.translate(plan.pre_table)
+        if plan.conv_num:
             text = cls.__conv_num(text)
-
-        if conv_units:
+        if plan.conv_units:
             text = cls.__conv_units(text)
+        return text.translate(plan.post_table)
 
-        if not other:
-            i = 0
-            while i < len(text):
-                if unicodedata.category(text[i]) not in constants._NOT_OTHER:
-                    text = text.replace(text[i], "")
-                i += 1
-        elif conv_other:
-            i = 0
-            while i < len(text):
-                if unicodedata.category(text[i]) not in constants._NOT_OTHER:
-                    text = text.replace(text[i], unicodedata.name(text[i]))
-                i += 1
-
-        if not punc:
-            i = 0
-            while i < len(text):
-                if unicodedata.category(text[i]) in constants._PUNCTUATION:
-                    text = text.replace(text[i], "")
-                i += 1
+    def _stream_clean(
+        self,
+        chunks: Iterable[str],
+        space=False,
+        punc=False,
+        accent=False,
+        num=False,
+        conv_num=False,
+        conv_units=False,
+        other=False,
+        conv_other=False,
+        alpha="",
+    ) -> Iterator[str]:
+        """Clean text supplied in pieces. Takes the same options as _clean_input
+        and yields the same text in pieces.
+        """
+        plan = _cleaning_plan(
+            space,
+            punc,
+            accent,
+            num,
+            conv_num,
+            conv_units,
+            other,
+            conv_other,
+            alpha,
+        )
+        if not plan.staged:
+            for chunk in chunks:
+                yield chunk.translate(plan.table)
+            return
+
+        # A number and the words around it must be converted together, so
+        # everything after the last whitespace seen is held back for the next
+        # chunk.
+        lead = ""
+        pending = []
+        for chunk in chunks:
+            chunk = chunk.translate(plan.pre_table)
+            space = _LAST_SPACE.search(chunk)
+            if space is None:
+                pending.append(chunk)
+                continue
+            cut = space.end()
+            pending.append(chunk[:cut])
+            text, lead = self.__convert_part("".join(pending), lead, plan)
+            yield text.translate(plan.post_table)
+            pending = [chunk[cut:]]
+        text, lead = self.__convert_part("".join(pending), lead, plan)
+        yield text.translate(plan.post_table)
 
-        if not space:
-            for char in string.whitespace:
-                text = text.replace(char, "")
+    @classmethod
+    def _clean_bytes(
+        cls,
+        data: bytes,
+        space=False,
+        punc=False,
+        accent=False,
+        num=False,
+        conv_num=False,
+        conv_units=False,
+        other=False,
+        conv_other=False,
+        alpha="",
+    ) -> bytes:
+        """Clean ASCII text held in bytes. Takes the same options as _clean_input.
+        Bytes outside of ASCII are left as they are.
+        """
+        plan = _cleaning_plan(
+            space,
+            punc,
+            accent,
+            num,
+            conv_num,
+            conv_units,
+            other,
+            conv_other,
+            alpha,
+        )
+        tables = plan.byte_table()
+        if tables is None:
+            raise ValueError(
+                "these cleaning options can't be applied to bytes"
+            )
+        return data.translate(*tables)
 
-        return text.upper()
+    @classmethod
+    def __convert_part(cls, text, lead, plan):
+        if plan.conv_num:
+            text, lead = cls.__conv_num_part(text, lead)
+        if plan.conv_units:
+            text = cls.__conv_units(text)
+        return text, lead
 
     @staticmethod
     def _create_grid(key: str, size=5) -> List[List]:
@@ -249,3 +721,187 @@ class CipherMachine(ABC):
         return "".join(
             [char for char in text if not (char in seen or seen.add(char))]
         )
+
+
+def _ic(freqs: Iterable[int], length: int, size: int) -> float:
+    # Index of coincidence of letter counts summing to length.
+    if length < 2:
+        return 0.0
+    phio = sum(freq * (freq - 1) for freq in freqs)
+    return size * phio / (length * (length - 1))
+
+
+# A number, with any thousands separators or decimal point inside it.
+_NUMBER = re.compile(r"(\d+(?:[.,]\d+)*)(?:,\Z)?")
+
+# The last whitespace character in a text.
+_LAST_SPACE = re.compile(r"\s(?=\S*\Z)")
+
+
+@lru_cache(maxsize=None)
+def _year_phrases() -> "re.Pattern[str]":
+    # Matches any of the phrases which mark the number after them as a year.
+    phrases = sorted(constants._WORDS_BEFORE_YEAR, key=len, reverse=True)
+    return re.compile("|".join(re.escape(p.upper()) for p in phrases))
+
+
+@lru_cache(maxsize=1024)
+def _num_words(num: str, to: str = "cardinal") -> str:
+    # num2words loads every language it supports, so it is only imported
+    # once a number actually needs converting.
+    from num2words import num2words
+
+    return num2words(num, to=to)
+
+
+# Character classes used by the cleaning plans.
+_OTHER = 1
+_PUNC = 2
+
+
+def _classify(char: str) -> int:
+    category = unicodedata.category(char)
+    char_class = 0
+    if category not in constants._NOT_OTHER:
+        char_class |= _OTHER
+    if category in constants._PUNCTUATION:
+        char_class |= _PUNC
+    return char_class
+
+
+@lru_cache(maxsize=None)
+def _bmp_classes() -> bytes:
+    """Character classes of the whole Basic Multilingual Plane, indexed by code
+    point. Built on first use rather than at import."""
+    return bytes(_classify(chr(code_point)) for code_point in range(0x10000))
+
+
+def _char_class(char: str) -> int:
+    code_point = ord(char)
+    if code_point < 0x10000:
+        return _bmp_classes()[code_point]
+    # Astral code points are rare enough to look up directly.
+    return _classify(char)
+
+
+class _DecisionCache(dict):
+    """A str.translate table which decides what each code point becomes the
+    first time it is seen and remembers the answer for every later call."""
+
+    __slots__ = ("_decide",)
+
+    def __init__(self, decide):
+        super().__init__()
+        self._decide = decide
+
+    def __missing__(self, code_point: int) -> str:
+        result = self[code_point] = self._decide(chr(code_point))
+        return result
+
+
+class _CleaningPlan:
+    def __init__(
+        self,
+        space,
+        punc,
+        accent,
+        num,
+        conv_num,
+        conv_units,
+        other,
+        conv_other,
+        alpha,
+    ):
+        """The compiled form of one CipherMachine._clean_input flag combination.
+        Every step of the cleaning is decided per character, so the whole
+        cleaning becomes a single str.translate call whose table is filled in
+        lazily. Number and unit conversion need to see whole words, so when
+        they are enabled the cleaning is split into a table applied before the
+        conversion and one applied after it.
+        """
+        self.space = space
+        self.punc = punc
+        self.accent = accent
+        self.num = num
+        self.other = other
+        self.conv_other = conv_other
+        self.alpha = alpha
+
+        # An alphabet makes _clean_input return before any conversion.
+        self.conv_num = num and conv_num and alpha == ""
+        self.conv_units = conv_units and alpha == ""
+        self.staged = self.conv_num or self.conv_units
+
+        self.table = _DecisionCache(lambda char: self._post(self._pre(char)))
+        self.pre_table = _DecisionCache(self._pre)
+        self.post_table = _DecisionCache(self._post)
+        self._byte_table = None
+
+    def byte_table(self) -> Optional[Tuple[bytes, bytes]]:
+        """Arguments for bytes.translate which clean ASCII text the same way,
+        or None if the plan can't be applied to bytes."""
+        if self._byte_table is None and not self.staged:
+            table = bytearray(range(256))
+            delete = bytearray()
+            for code_point in range(128):
+                out = self.table[code_point]
+                if out == "":
+                    delete.append(code_point)
+                elif len(out) == 1 and out.isascii():
+                    table[code_point] = ord(out)
+                else:
+                    return None
+            self._byte_table = bytes(table), bytes(delete)
+        return self._byte_table
+
+    def _pre(self, char: str) -> str:
+        text = char.upper()
+
+        if not self.accent:
+            normal = unicodedata.normalize("NFD", text)
+            text = "".join(c for c in normal if not unicodedata.combining(c))
+
+        if self.alpha != "":
+            return "".join(c for c in text if c in self.alpha)
+
+        if not self.num:
+            text = "".join(c for c in text if c not in string.digits)
+
+        return text
+
+    def _post(self, text: str) -> str:
+        if self.alpha != "":
+            return text
+
+        if not self.other:
+            text = "".join(c for c in text if not _char_class(c) & _OTHER)
+        elif self.conv_other:
+            text = "".join(
+                unicodedata.name(c) if _char_class(c) & _OTHER else c
+                for c in text
+            )
+
+        if not self.punc:
+            text = "".join(c for c in text if not _char_class(c) & _PUNC)
+
+        if not self.space:
+            text = "".join(c for c in text if c not in string.whitespace)
+
+        return text.upper()
+
+
+@lru_cache(maxsize=128)
+def _cleaning_plan(
+    space, punc, accent, num, conv_num, conv_units, other, conv_other, alpha
+) -> _CleaningPlan:
+    return _CleaningPlan(
+        space,
+        punc,
+        accent,
+        num,
+        conv_num,
+        conv_units,
+        other,
+        conv_other,
+        alpha,
+    )
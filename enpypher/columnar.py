@@ -1,18 +1,65 @@
-import math
-from typing import List
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from enpypher.cipher_machine import CipherMachine
 
 
 class Columnar(CipherMachine):
+    @classmethod
+    def crack(
+        cls,
+        ct: str,
+        max_width: int = 12,
+        restarts: int = 200,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+        exhaustive: bool = False,
+    ) -> Tuple[List[Tuple[str, float]], "Columnar"]:
+        """Recover the key of an English ciphertext. For each width the order
+        of the columns is found by hill climbing on the digrams across
+        neighbouring columns, or for keys up to 9 wide optionally by trying
+        every order, and the widths are compared by quadgrams.
+
+        Args:
+            ct (str): The ciphertext.
+            max_width (int, optional): The longest key tried. Defaults to 12.
+            restarts (int, optional): The most orders climbed from for each
+                width. Defaults to 200.
+            seed (int, optional): Seed for the random swaps. Defaults to None.
+            workers (int, optional): The number of processes to share the key
+                widths between. Defaults to None, trying them all in this
+                process.
+            exhaustive (bool, optional): Whether to try every order of the
+                columns for keys up to 9 wide instead of climbing. Defaults to
+                False.
+
+        Returns:
+            Tuple[List[Tuple[str, float]], Columnar]: The best key found for
+                each width with its quadgram score per letter, best first, and
+                a machine set up with the best of them.
+        """
+        from enpypher.solve import columnar
+
+        return columnar.crack(
+            ct, max_width, restarts, seed, workers, exhaustive
+        )
+
     def _cipher(self, text: str, encipher: bool) -> str:
+        cols = len(self.col_map)
+        if not cols:
+            raise ValueError("the key has no letters from the alphabet")
         if encipher:
             text = self._clean_input(
                 text, True, True, False, True, False, False, True, False
             )
-        grid = self._write_grid(text, encipher)
-        print(grid)
-        return self._read_grid(grid, encipher)
+            # Column c of the grid the text is written into row by row is
+            # every colsth character from c.
+            return "".join(text[col::cols] for col in self.col_map)
+
+        src, dst = self._code_units(text)
+        for col, start, stop in _column_blocks(tuple(self.col_map), len(text)):
+            dst[col::cols] = src[start:stop]
+        return self._from_code_units(dst)
 
     def set_key(self, key):
         self.input_key = key
@@ -21,41 +68,18 @@ class Columnar(CipherMachine):
             i for i, _ in sorted(enumerate(self.clean_key), key=lambda x: x[1])
         ]
 
-    # Helpers
-    def _write_grid(self, text: str, encipher: bool) -> List[List[str]]:
-        cols = len(self.clean_key)
-        rows = math.ceil(len(text) / cols)
-        last_len = len(text) % cols
-        if last_len == 0:
-            last_len = cols
-
-        grid = [[""] * cols for _ in range(rows)]
 
-        i = 0
-        if encipher:
-            for row in range(rows):
-                for col in range(cols):
-                    if i < len(text):
-                        grid[row][col] = text[i]
-                        i += 1
-        else:
-            for col in self.col_map:
-                for row in range(rows):
-                    if i < len(text) and (row < rows - 1 or col < last_len):
-                        grid[row][col] = text[i]
-                        i += 1
-
-        return grid
-
-    def _read_grid(self, grid: List[List[str]], encipher: bool) -> str:
-        new_text = []
-        if encipher:
-            for col in self.col_map:
-                for row in range(len(grid)):
-                    new_text.append(grid[row][col])
-        else:
-            for row in grid:
-                for char in row:
-                    new_text.append(char)
-
-        return "".join(new_text)
+@lru_cache(maxsize=256)
+def _column_blocks(
+    col_map: Tuple[int, ...], length: int
+) -> List[Tuple[int, int, int]]:
+    # Each column in the order it is read off, with where it starts and stops
+    # in a ciphertext of the given length. The first length % cols columns of
+    # the grid have one more character than the rest.
+    blocks = []
+    start = 0
+    for col in col_map:
+        stop = start + len(range(col, length, len(col_map)))
+        blocks.append((col, start, stop))
+        start = stop
+    return blocks
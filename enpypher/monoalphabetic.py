@@ -1,7 +1,5 @@
 import string
 
-from bidict import bidict
-
 from enpypher.cipher_machine import CipherMachine
 
 
@@ -21,26 +19,53 @@ class Monoalphabetic(CipherMachine):
         super().__init__(key, alpha)
 
     def _cipher(self, text, encihper):
-        text = text.upper()
         if encihper:
             text = self._clean_input(
                 text, True, True, False, True, False, False, True, False
             )
+        else:
+            text = text.upper()
+
+        return self._substitute(text, encihper)
+
+    def _stream(self, chunks, encipher):
+        if encipher:
+            chunks = self._stream_clean(
+                chunks, True, True, False, True, False, False, True, False
+            )
+        else:
+            chunks = map(str.upper, chunks)
+
+        for chunk in chunks:
+            yield self._substitute(chunk, encipher)
 
-        new_text = []
-        for char in text:
-            if char in self.key_map:
-                if encihper:
-                    new_text.append(self.key_map[char])
-                else:
-                    new_text.append(self.key_map.inv[char])
-            else:
-                new_text.append(char)
+    def _substitute(self, text, encipher):
+        # str.translate already works through the text in C, so there is no
+        # numpy engine to choose here.
+        return text.translate(self._tables[encipher])
 
-        return "".join(new_text)
+    def _joinable(self, encipher):
+        return True
+
+    def _cipher_bytes(self, data, encipher):
+        table = self._byte_table(encipher)
+        if table is None:
+            raise ValueError("this key can't be applied to bytes")
+        return data.translate(*table)
+
+    def _can_cipher_bytes(self, encipher):
+        return self._byte_table(encipher) is not None
+
+    def _byte_table(self, encipher):
+        if encipher not in self._byte_tables:
+            self._byte_tables[encipher] = self._ascii_table(encipher)
+        return self._byte_tables[encipher]
 
     def set_key(self, key: str):
+        from bidict import bidict
+
         self.input_key = key
+        self._byte_tables = {}
         clean = self._rm_dup(
             self._clean_input(self.input_key, alpha=self.alpha)
         )
@@ -50,3 +75,8 @@ class Monoalphabetic(CipherMachine):
         self.key_map = bidict(
             {self.alpha[i]: clean[i] for i in range(len(self.alpha))}
         )
+        # Enciphering and deciphering are each a single translate call.
+        self._tables = {
+            True: str.maketrans(self.alpha, clean),
+            False: str.maketrans(clean, self.alpha),
+        }
@@ -1,11 +1,26 @@
-import random
+import io
+import mmap
+import os
+import secrets
 import string
+from contextlib import contextmanager
+from operator import add, sub
+from typing import Callable, Iterator, Optional, Union
 
+from enpypher.cipher_machine import CipherMachine
 from enpypher.vigenere import Vigenere
 
+# Random bytes are drawn this many at a time when writing a pad file.
+_PAD_BLOCK_SIZE = 1 << 20
+
 
 class OTP(Vigenere):
-    def __init__(self, alpha=string.ascii_uppercase):
+    def __init__(
+        self,
+        alpha=string.ascii_uppercase,
+        pad_file: Optional[Union[str, os.PathLike]] = None,
+        pad_offset: Optional[int] = None,
+    ):
         """A One Time Pad maps provides unbreakable encryption in theory by using the Vigenère
         mechanism with a completely random key that is as long as the plaintext. A OTP
         object will take an alphabet (English by default) as input and when a call to encipher()
@@ -13,18 +28,238 @@ class OTP(Vigenere):
         the Vigenère cipher. When a call to decipher() is made, the key currently in use will be
         used to reverse the Vigenère encipherment.
 
+        Given a pad file, as written by write_pad(), both encipher() and decipher() instead
+        take the next letters of the pad from the file, starting at pad_offset, so that no
+        part of the pad is ever used twice. The offset is saved next to the pad, in a file
+        named after it ending in ".offset", as the pad is used, so a new OTP given the same
+        pad file carries on where the last one stopped. encipher() never starts before the
+        saved offset, while decipher() can be pointed back at a message already read.
+
         Args:
             alpha (str, optional): The plaintext alphabet. Defaults to string.ascii_uppercase.
+            pad_file (str | os.PathLike, optional): A file of pad letters to use up. Defaults to None.
+            pad_offset (int, optional): How many letters of the pad file have been used. Defaults
+                to None, reading the offset saved next to the pad, or 0 if there is none.
         """
         self.set_alpha(alpha)
         self.set_key("")
+        self.pad_file = pad_file
+        if pad_offset is None:
+            pad_offset = self._saved_offset() if pad_file is not None else 0
+        self.pad_offset = pad_offset
+
+    def write_pad(self, path: Union[str, os.PathLike], length: int) -> None:
+        """Write a new random pad to a file, holding the index in the alphabet
+        of each letter as a single byte.
+
+        Args:
+            path (str | os.PathLike): The file to write the pad to.
+            length (int): The number of letters in the pad.
+        """
+        with open(path, "wb") as file:
+            for start in range(0, length, _PAD_BLOCK_SIZE):
+                file.write(
+                    self._random_pad(min(_PAD_BLOCK_SIZE, length - start))
+                )
+        # None of the new pad has been used.
+        try:
+            os.remove(self._offset_path(path))
+        except FileNotFoundError:
+            pass
+
+    def _cipher(self, text, encipher):
+        return "".join(self._stream([text], encipher))
+
+    def _cipher_batch(self, texts, encipher):
+        if encipher:
+            raise TypeError("every one time pad message needs its own key")
+        # Each message is deciphered from the start of the pad, one at a
+        # time.
+        return CipherMachine._cipher_batch(self, texts, encipher)
+
+    def _cipher_bytes(self, data, encipher):
+        return b"".join(self._stream_bytes([data], encipher))
+
+    def _stream_bytes(self, blocks, encipher):
+        with self._pad_reader(encipher) as take:
+            for block in blocks:
+                if isinstance(block, str):
+                    yield self._pad_text(
+                        self._prepare_text(block, encipher), encipher, take
+                    )
+                else:
+                    yield self._pad_bytes(
+                        self._prepare_bytes(block, encipher), encipher, take
+                    )
+
+    def _stream(self, chunks, encipher):
+        with self._pad_reader(encipher) as take:
+            for chunk in self._prepare_chunks(chunks, encipher):
+                yield self._pad_text(chunk, encipher, take)
+
+    @contextmanager
+    def _pad_reader(self, encipher: bool) -> Iterator[Callable[[int], bytes]]:
+        # Gives a function taking the next n indices of the pad.
+        if self.pad_file is not None:
+            if encipher:
+                # Other machines may have used the pad since this one did.
+                self.pad_offset = max(self.pad_offset, self._saved_offset())
+            with open(self.pad_file, "rb") as file:
+                if not os.fstat(file.fileno()).st_size:
+                    # Empty files can't be memory-mapped.
+                    yield lambda n: b""
+                    return
+                with mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mapped:
+
+                    def take(n):
+                        pad = mapped[self.pad_offset : self.pad_offset + n]
+                        # A pad that runs out is left for a shorter message.
+                        if len(pad) == n:
+                            self.pad_offset += n
+                            self._save_offset()
+                        return pad
+
+                    yield take
+        elif encipher:
+            # The length of the plaintext isn't known up front, so the pad is
+            # drawn a chunk at a time and only stored once the text is done.
+            drawn = []
+
+            def take(n):
+                drawn.append(self._random_pad(n))
+                return drawn[-1]
+
+            yield take
+            self._pad = b"".join(drawn)
+        else:
+            yield io.BytesIO(self._pad).read
+
+    @staticmethod
+    def _offset_path(pad_file: Union[str, os.PathLike]) -> str:
+        return os.fspath(pad_file) + ".offset"
+
+    def _saved_offset(self) -> int:
+        try:
+            with open(self._offset_path(self.pad_file)) as file:
+                return int(file.read())
+        except FileNotFoundError:
+            return 0
+
+    def _save_offset(self) -> None:
+        # Written as soon as the pad is taken, and swapped in whole, so the
+        # saved offset is never behind the pad already used, even when a
+        # message is deciphered again from an earlier offset.
+        offset = max(self.pad_offset, self._saved_offset())
+        path = self._offset_path(self.pad_file)
+        with open(path + ".tmp", "w") as file:
+            file.write(str(offset))
+        os.replace(path + ".tmp", path)
+
+    def _pad_text(
+        self, text: str, encipher: bool, take: Callable[[int], bytes]
+    ) -> str:
+        if not self.alpha:
+            return text
+        parts = self._non_alpha_runs.split(text)
+        letters = "".join(parts[::2])
+        if not letters:
+            return text
+        pad = self._checked_pad(take, len(letters))
+
+        if self.engine == "numpy":
+            from enpypher import _numpy_engine
+
+            key = pad.decode("latin-1").translate(self._from_index)
+            return _numpy_engine.shift(text, self.alpha, key, encipher, 0)[0]
+
+        # Adding indices runs past the end of the doubled alphabet no further
+        # than subtracting them runs back past its start.
+        shifted = "".join(
+            map(
+                self._doubled.__getitem__,
+                map(
+                    add if encipher else sub,
+                    letters.translate(self._to_index).encode("latin-1"),
+                    pad,
+                ),
+            )
+        )
+        return self._merge_letters(parts, shifted)
+
+    def _pad_bytes(
+        self, data: bytes, encipher: bool, take: Callable[[int], bytes]
+    ) -> bytes:
+        if not self.alpha.isascii():
+            raise ValueError("bytes need an ASCII alphabet")
+        letters = data.translate(None, self._non_letters)
+        if not letters:
+            return data
+        pad = self._checked_pad(take, len(letters))
+
+        doubled = self._doubled.encode("ascii")
+        shifted = bytes(
+            map(
+                doubled.__getitem__,
+                map(
+                    add if encipher else sub,
+                    letters.translate(self._byte_index),
+                    pad,
+                ),
+            )
+        )
+        return self._merge_bytes(data, letters, shifted)
+
+    @staticmethod
+    def _checked_pad(take: Callable[[int], bytes], length: int) -> bytes:
+        pad = take(length)
+        if len(pad) < length:
+            raise ValueError("the pad is shorter than the text")
+        return pad
+
+    def _random_pad(self, length: int) -> bytes:
+        # Random bytes are kept only below the largest multiple of the
+        # alphabet's length, so that every index is equally likely, and taken
+        # modulo its length, many at a time by bytes.translate.
+        if not length:
+            return b""
+        pad = bytearray()
+        while len(pad) < length:
+            needed = length - len(pad)
+            pad += secrets.token_bytes(
+                needed * 256 // self._pad_limit + 64
+            ).translate(self._pad_table, self._pad_rejects)
+        return bytes(pad[:length])
+
+    def key(self):
+        return self._pad.decode("latin-1").translate(self._from_index)
+
+    def set_key(self, key: str):
+        self._pad = (
+            self._clean_input(key, alpha=self.alpha)
+            .translate(self._to_index)
+            .encode("latin-1")
+        )
+
+    def set_alpha(self, alpha):
+        super().set_alpha(alpha)
+        if len(self.alpha) > 256:
+            raise ValueError("a pad alphabet has at most 256 letters")
 
-    def encipher(self, pt: str) -> str:
-        aset = set(self.alpha)
-        length = sum(1 for char in pt if char in aset)
-        self.clean_key = self._rand_string(length)
-        self.input_key = self.clean_key
-        return super().encipher(pt)
+        # Each letter of the pad is kept as its index in the alphabet.
+        indices = "".join(map(chr, range(len(self.alpha))))
+        self._to_index = str.maketrans(self.alpha, indices)
+        self._from_index = str.maketrans(indices, self.alpha)
+        self._doubled = self.alpha * 2
+        self._byte_index = bytes.maketrans(
+            self.alpha.encode("ascii", "replace"),
+            indices.encode("latin-1"),
+        )
 
-    def _rand_string(self, length):
-        return "".join(random.choice(self.alpha) for i in range(length))
+        self._pad_limit = 256 - 256 % len(self.alpha) if self.alpha else 256
+        self._pad_table = bytes.maketrans(
+            bytes(range(self._pad_limit)),
+            bytes(i % max(len(self.alpha), 1) for i in range(self._pad_limit)),
+        )
+        self._pad_rejects = bytes(range(self._pad_limit, 256))
@@ -1,37 +1,98 @@
+import io
+import re
 import string
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from enpypher.cipher_machine import CipherMachine
 
+# Matches each letter followed by the same letter again.
+_DOUBLED_LETTERS = re.compile(r"(.)(?=\1)", re.DOTALL)
+
 
 class Playfair(CipherMachine):
     def __init__(self, key, alpha=string.ascii_uppercase.replace("J", "")):
         super().__init__(key, alpha)
 
+    @classmethod
+    def crack(
+        cls,
+        ct: str,
+        chains: int = 4,
+        steps: int = 100000,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> Tuple[List[Tuple[str, float]], "Playfair"]:
+        """Recover the key square of an English ciphertext by simulated
+        annealing, changing the square a little at a time and scoring what
+        it deciphers by quadgrams.
+
+        Args:
+            ct (str): The ciphertext.
+            chains (int, optional): The number of squares annealed from random
+                starts. Defaults to 4.
+            steps (int, optional): The number of changes tried in each chain.
+                Defaults to 100000.
+            seed (int, optional): Seed for the random changes. Defaults to
+                None.
+            workers (int, optional): The number of processes to share the
+                chains between. Defaults to None, running them all in this
+                process.
+
+        Returns:
+            Tuple[List[Tuple[str, float]], Playfair]: The best square found by
+                each chain with its quadgram score per letter, best first, and
+                a machine set up with the best of them.
+        """
+        from enpypher.solve import playfair
+
+        return playfair.crack(ct, chains, steps, seed, workers)
+
     def _cipher(self, text: str, encipher) -> str:
         if encipher:
             text = self._prepare_pt(text)
-        text = text.upper()
-        new = []
-        non_alpha = []
-        digram = []
-        for char in text:
-            if char in self.alpha:
-                digram.append(char)
-                if len(digram) == 2:
-                    new.extend(self._process_digram(digram, encipher))
-
-                    digram = []
-            else:
-                non_alpha.append(char)
-
-        result = self._merge_text(text, new, non_alpha)
+        else:
+            text = text.upper()
+
+        result = self._digrams(text, encipher)
 
         if not encipher:
             result = result.lower()
 
         return result
 
+    def _stream(self, chunks, encipher):
+        if encipher:
+            chunks = self._prepare_chunks(chunks)
+        else:
+            chunks = map(str.upper, chunks)
+
+        # A letter waiting for the other half of its digram is held back,
+        # along with anything that follows it, until the digram is complete.
+        held = ""
+        for chunk in chunks:
+            text = held + chunk
+            letters = [
+                i for i, char in enumerate(text) if char in self._letters
+            ]
+            cut = letters[-1] if len(letters) % 2 else len(text)
+            yield self._digrams(text[:cut], encipher)
+            held = text[cut:]
+        yield self._digrams(held, encipher)
+
+    def _digrams(self, text: str, encipher) -> str:
+        # The letters are pulled out of the text, looked up two at a time in
+        # the digram table, and put back between the other characters.
+        parts = self._non_alpha_runs.split(text)
+        letters = "".join(parts[::2])
+        if len(letters) % 2:
+            raise ValueError("the text has an odd number of letters")
+
+        table = self._digram_tables[encipher]
+        new = "".join(
+            [table[letters[i : i + 2]] for i in range(0, len(letters), 2)]
+        )
+        return self._merge_text(parts, new)
+
     def set_key(self, key: str):
         self.input_key = key
         clean_str = self._rm_dup(
@@ -41,6 +102,10 @@ class Playfair(CipherMachine):
         self.key_coord = {
             char: (i // 5, i % 5) for i, char in enumerate(clean_str)
         }
+        self._digram_tables = {
+            encipher: self._digram_table(encipher)
+            for encipher in (True, False)
+        }
 
     def set_alpha(self, alpha):
         super().set_alpha(alpha + "♠♣♥♦♤♧♡♢♪♫♬♩𝄞™℗ℒ№©®§¶•✺✿∞")
@@ -48,43 +113,71 @@ class Playfair(CipherMachine):
         # If not enough characters are provided, letters of the
         # filler characters will be appended to fill empty spaces.
         self.alpha = (self.alpha)[:25]
+        self._letters = set(self.alpha)
+        self._non_alpha_runs = re.compile(f"([^{re.escape(self.alpha)}]+)")
 
     ### HELPERS
 
     def _prepare_pt(self, pt: str) -> str:
-        pt = self._clean_input(
-            pt, True, True, False, True, False, False, True, False
-        )
-        if self.alpha == string.ascii_uppercase.replace("J", ""):
-            pt = pt.replace("J", "I")
+        return "".join(self._prepare_chunks([pt]))
 
+    def _prepare_chunks(self, chunks: Iterable[str]) -> Iterator[str]:
         filler = (
             "X"
             if self.alpha == string.ascii_uppercase.replace("J", "")
             else self.alpha[-1]
         )
 
+        letters = self._letters
         num_alpha = 0
-        new_pt = []
-
         prev_char = None
-        for char in pt:
-            if char in self.alpha:
-                num_alpha += 1
-
-                if prev_char == char and num_alpha % 2 == 0:
-                    num_alpha += 1
+        for pt in self._stream_clean(
+            chunks, True, True, False, True, False, False, True, False
+        ):
+            if self.alpha == string.ascii_uppercase.replace("J", ""):
+                pt = pt.replace("J", "I")
+
+            places = [i for i, char in enumerate(pt) if char in letters]
+            if not places:
+                yield pt
+                continue
+
+            # A letter the same as the one before it gets a filler put in
+            # front of it if the two would otherwise make up a digram.
+            text_letters = "".join(map(pt.__getitem__, places))
+            doubled = [
+                match.end()
+                for match in _DOUBLED_LETTERS.finditer(text_letters)
+            ]
+            if text_letters[0] == prev_char:
+                doubled.insert(0, 0)
+
+            new_pt = []
+            start = 0
+            for j in doubled:
+                if (num_alpha + j) % 2:
+                    new_pt.append(pt[start : places[j]])
                     new_pt.append(filler)
-                new_pt.append(char)
-
-                prev_char = char
-            else:
-                new_pt.append(char)
+                    start = places[j]
+                    num_alpha += 1
+            new_pt.append(pt[start:])
+            num_alpha += len(places)
+            prev_char = text_letters[-1]
+            yield "".join(new_pt)
 
         if num_alpha % 2 != 0:
-            new_pt.append(filler)
-
-        return "".join(new_pt)
+            yield filler
+
+    def _digram_table(self, encipher) -> Dict[str, str]:
+        # Every digram of the square with what it becomes, so that the text
+        # is ciphered by one lookup per digram.
+        table = {}
+        for first in self.key_coord:
+            for second in self.key_coord:
+                table[first + second] = "".join(
+                    self._process_digram(first + second, encipher)
+                )
+        return table
 
     def _process_digram(self, digram, encipher) -> List[str]:
         new_di = []
@@ -106,15 +199,11 @@ class Playfair(CipherMachine):
 
         return new_di
 
-    def _merge_text(self, text, new: List[str], non_alpha: List[str]) -> str:
-        full_text = []
-        i, j = 0, 0
-        for char in text:
-            if char in self.alpha:
-                full_text.append(new[i])
-                i += 1
-            else:
-                full_text.append(non_alpha[j])
-                j += 1
-
-        return "".join(full_text)
+    @staticmethod
+    def _merge_text(parts: List[str], new: str) -> str:
+        # Puts the new letters in place of the runs of letters at the even
+        # indices of a text split around its other characters.
+        if len(parts) == 1:
+            return new
+        parts[::2] = map(io.StringIO(new).read, map(len, parts[::2]))
+        return "".join(parts)
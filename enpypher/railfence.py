@@ -1,24 +1,91 @@
+import string
+from typing import Iterator, List, Optional, Tuple
+
 from enpypher.cipher_machine import CipherMachine
 
 
 class Railfence(CipherMachine):
+    def __init__(self, key: int, alpha=string.ascii_uppercase, offset=0):
+        """A rail fence cipher writes the plaintext in a zig-zag down and up a number of
+        rails, then reads the rails off one after the other. A Railfence object will take
+        a key (the number of rails), alphabet (English by default) and offset (how far
+        into the zig-zag the plaintext starts) as input and when a call to encipher() is
+        made, will rearrange the provided plaintext along the rails. When a call to
+        decipher() is made, the reverse will occur.
+
+        Args:
+            key (int): The number of rails.
+            alpha (str, optional): The plaintext alphabet. Defaults to string.ascii_uppercase.
+            offset (int, optional): The place in the zig-zag of the first letter. Defaults to 0.
+        """
+        self.offset = offset
+        super().__init__(key, alpha)
+
+    @classmethod
+    def crack(
+        cls,
+        ct: str,
+        max_rails: int = 20,
+        offsets: bool = False,
+        workers: Optional[int] = None,
+    ) -> List[Tuple[int, int, float]]:
+        """Rank every number of rails, and optionally every offset, by the
+        quadgram score of the start of the text each of them deciphers.
+
+        Args:
+            ct (str): The ciphertext.
+            max_rails (int, optional): The most rails tried. Defaults to 20.
+            offsets (bool, optional): Whether to try every offset into the
+                zig-zag as well. Defaults to False.
+            workers (int, optional): The number of processes to share the
+                candidates between. Defaults to None, trying them all in this
+                process.
+
+        Returns:
+            List[Tuple[int, int, float]]: Each number of rails and offset
+                with its quadgram score per letter, best first.
+        """
+        from enpypher.solve import railfence
+
+        return railfence.crack(ct, max_rails, offsets, workers)
+
     def _cipher(self, text: str, encipher: bool) -> str:
-        N = self.input_key - 1
-        rails = [[] for i in range(self.input_key)]
-        for i in range(len(text)):
-            rails[(i % N) if i // N % 2 == 0 else (N - (i % N))].append(i)
+        if self.input_key == 1:
+            return text
 
-        # Idea for mapping from reddit users u/adrian17 and u/jetRink
-        # https://www.reddit.com/r/dailyprogrammer/comments/2rnwzf/20150107_challenge_196_intermediate_rail_fence/
-        mapping = {
-            i: v for i, v in enumerate(i for rail in rails for i in rail)
-        }
-        if not encipher:
-            mapping = {v: k for k, v in mapping.items()}
+        # Each rail is read off in one slice assignment, or two interleaved
+        # ones for the rails the zig-zag passes on the way down and back up.
+        src, dst = self._code_units(text)
+        start = 0
+        for places, stop in self._rails(len(text)):
+            for n, place in enumerate(places):
+                block = slice(start + n, stop, len(places))
+                if encipher:
+                    dst[block] = src[place]
+                else:
+                    dst[place] = src[block]
+            start = stop
 
-        new_text = [text[mapping[i]] for i in range(len(text))]
+        return self._from_code_units(dst)
 
-        return "".join(new_text)
+    def _rails(self, length: int) -> Iterator[Tuple[Tuple[slice, ...], int]]:
+        # The places on each rail, top to bottom, as slices of a text of the
+        # given length, with where the rail ends in the ciphertext. The
+        # zig-zag repeats every 2 * (rails - 1) places, and every rail but
+        # the top and bottom one is passed twice in each repeat, the first
+        # time being whichever comes sooner after the offset.
+        period = 2 * (self.input_key - 1)
+        stop = 0
+        for rail in range(self.input_key):
+            starts = {(rail - self.offset) % period}
+            starts.add((period - rail - self.offset) % period)
+            places = tuple(
+                slice(start, length, period) for start in sorted(starts)
+            )
+            stop += sum(len(range(*place.indices(length))) for place in places)
+            yield places, stop
 
-    def set_key(self, key):
+    def set_key(self, key: int):
+        if key < 1:
+            raise ValueError("a rail fence needs at least one rail")
         self.input_key = key
@@ -1,6 +1,9 @@
 import string
+from collections import Counter
+from typing import List, Tuple
 
 from enpypher.monoalphabetic import Monoalphabetic
+from enpypher.solve import fitness
 
 
 class Shift(Monoalphabetic):
@@ -18,6 +21,29 @@ class Shift(Monoalphabetic):
         """
         super().__init__(key, alpha)
 
+    @classmethod
+    def crack(
+        cls, ct: str, alpha=string.ascii_uppercase
+    ) -> List[Tuple[int, float]]:
+        """Rank every shift by how closely the letters it deciphers a
+        ciphertext to match English letter frequencies. The ciphertext's
+        letters are counted once and each shift rotates the counts.
+
+        Args:
+            ct (str): The ciphertext.
+            alpha (str, optional): The plaintext alphabet. Defaults to
+                string.ascii_uppercase.
+
+        Returns:
+            List[Tuple[int, float]]: Each shift and its chi-square statistic,
+                most likely first.
+        """
+        counts = Counter(ct.upper())
+        scores = fitness.chi_squares(
+            [counts[char] for char in alpha], fitness.letter_frequencies(alpha)
+        )
+        return sorted(enumerate(scores), key=lambda shift: shift[1])
+
     def set_key(self, key):
         sub_alpha = "".join(self._rotate(list(self.alpha), key))
         super().set_key(sub_alpha)
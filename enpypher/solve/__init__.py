@@ -0,0 +1,26 @@
+"""Ciphertext-only solvers, which recover a machine's key from English
+ciphertext."""
+
+from itertools import starmap
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar
+
+_T = TypeVar("_T")
+
+
+def _map(
+    fn: Callable[..., _T],
+    tasks: Iterable[Tuple],
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+) -> List[_T]:
+    # Calls fn with each tuple of arguments, in order, shared between worker
+    # processes when there are at least two.
+    tasks = list(tasks)
+    if workers is None or workers < 2 or not tasks:
+        return list(starmap(fn, tasks))
+
+    # Imported here as it takes a while and is only needed for workers.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(fn, *zip(*tasks), chunksize=chunksize))
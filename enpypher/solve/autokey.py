@@ -0,0 +1,141 @@
+"""Recovery of an Autokey primer from ciphertext alone.
+
+With a primer of length k, every kth letter forms a lane: each plaintext
+letter is the ciphertext letter less the plaintext letter k places back, so a
+whole lane follows from the one primer letter that starts it. Every primer
+length is solved lane by lane by letter frequencies, and those that fit
+English best are improved by quadgrams, rescoring only the quadgrams that
+touch the lane being changed.
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+from enpypher.autokey import Autokey
+from enpypher.solve import _map, fitness
+
+# Letters deciphered for each primer length; the primer only affects the
+# start of the text, and this many is plenty to recover it.
+_SAMPLE = 1 << 11
+
+# How many of the primer lengths fitting English letter frequencies best are
+# solved by quadgrams.
+_LENGTH_CANDIDATES = 4
+
+
+def crack(
+    ct: str, max_length: int = 20, workers: Optional[int] = None
+) -> Tuple[List[Tuple[str, float]], Autokey]:
+    """Recover the primer of an English Autokey ciphertext.
+
+    Args:
+        ct (str): The ciphertext, enciphered with the English alphabet.
+        max_length (int, optional): The longest primer tried. Defaults to 20.
+        workers (int, optional): The number of processes to share the primer
+            lengths between. Defaults to None, trying them all in this
+            process.
+
+    Returns:
+        Tuple[List[Tuple[str, float]], Autokey]: The primer found for each
+            of the likeliest lengths with its quadgram score per letter, best
+            first, and a machine set up with the best of them.
+    """
+    letters = fitness.indices(ct)[:_SAMPLE]
+    if not letters:
+        raise ValueError("the ciphertext has no letters")
+    lengths = range(1, max(min(max_length, len(letters)), 1) + 1)
+    fits = {
+        length: _frequency_primer(_lanes(letters, length))[1]
+        for length in lengths
+    }
+    lengths = sorted(lengths, key=fits.get)[-_LENGTH_CANDIDATES:]
+    found = _map(
+        _solve_length, [(letters, length) for length in lengths], workers
+    )
+
+    ranked = sorted(found, key=lambda primer: -primer[1])
+    return ranked, Autokey(ranked[0][0])
+
+
+def _lanes(letters: List[int], length: int) -> List[List[List[int]]]:
+    # Along a lane the plaintext is an alternating sum of the ciphertext,
+    # less the primer letter at even places and plus it at odd ones. Each
+    # lane is deciphered with every letter that could start it.
+    lanes = []
+    for r in range(min(length, len(letters))):
+        sums = []
+        total = 0
+        for c in letters[r::length]:
+            total = c - total
+            sums.append(total)
+        lanes.append(
+            [
+                [(a + (s if j % 2 else -s)) % 26 for j, a in enumerate(sums)]
+                for s in range(26)
+            ]
+        )
+    return lanes
+
+
+def _frequency_primer(lanes: List[List[List[int]]]) -> Tuple[List[int], float]:
+    # The primer whose lanes best fit English letter frequencies, with the
+    # mean log likelihood of their letters.
+    logs = [math.log(freq) for freq in fitness.letter_frequencies()]
+    primer = []
+    total = 0.0
+    for lane in lanes:
+        fits = [sum(map(logs.__getitem__, letters)) for letters in lane]
+        primer.append(max(range(26), key=fits.__getitem__))
+        total += fits[primer[-1]]
+    return primer, total / max(sum(len(lane[0]) for lane in lanes), 1)
+
+
+def _solve_length(letters: List[int], length: int) -> Tuple[str, float]:
+    # Each primer letter starts as the one whose lane best fits English
+    # letter frequencies.
+    lanes = _lanes(letters, length)
+    primer = _frequency_primer(lanes)[0]
+    plain = [0] * len(letters)
+    for r, lane in enumerate(lanes):
+        plain[r::length] = lane[primer[r]]
+
+    # Then each is changed while that improves the quadgrams its lane is in.
+    table = fitness.ngram_table(4)
+    touched = [
+        sorted(
+            {
+                t
+                for i in range(r, len(letters), length)
+                for t in range(max(i - 3, 0), min(i, len(letters) - 4) + 1)
+            }
+        )
+        for r in range(len(lanes))
+    ]
+
+    def lane_score(r):
+        return sum(
+            table[
+                ((plain[t] * 26 + plain[t + 1]) * 26 + plain[t + 2]) * 26
+                + plain[t + 3]
+            ]
+            for t in touched[r]
+        )
+
+    improved = True
+    while improved:
+        improved = False
+        for r, lane in enumerate(lanes):
+            best, best_score = primer[r], lane_score(r)
+            for s in range(26):
+                if s != primer[r]:
+                    plain[r::length] = lane[s]
+                    score = lane_score(r)
+                    if score > best_score:
+                        best, best_score = s, score
+            plain[r::length] = lane[best]
+            if best != primer[r]:
+                primer[r] = best
+                improved = True
+
+    score = fitness.score(plain) / max(len(plain), 1)
+    return "".join(fitness.ALPHA[s] for s in primer), score
@@ -0,0 +1,323 @@
+"""Recovery of a Columnar key by hill climbing over the order of its columns,
+or for short keys by trying every order of them.
+
+For a key of a given width, the ciphertext is read back into the columns of
+the grid in the key's order, each column taking a block of the ciphertext.
+Where a block starts depends only on the lengths of the blocks before it, so
+a key is scored by the digrams across each pair of neighbouring columns,
+looked up by where their blocks start. Moving columns around then only costs
+a lookup per column, however long the text.
+
+Every order of the columns is tried in the order of plain changes, where
+each order is the last one with two neighbouring columns swapped. Only the
+blocks of those two columns move, so only the digrams across them are looked
+up again.
+"""
+
+import random
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from enpypher.columnar import Columnar
+from enpypher.solve import _map, fitness
+
+# Rows of the grid scored for each key; the first rows are enough to tell
+# the right order of the columns.
+_SCORE_ROWS = 64
+
+# Characters deciphered to compare the keys found for different widths.
+_SCORE_SAMPLE = 1 << 12
+
+# The least random swaps made to the best order before climbing again; the
+# most is half the width.
+_SHAKE_SWAPS = 2
+
+# A width is given up on after this many climbs in a row find nothing better.
+_PATIENCE = 50
+
+# The widest key whose orders can all be tried in a few seconds.
+_EXHAUSTIVE_WIDTH = 9
+
+# Stands for every character that isn't a letter.
+_OTHER = 26
+
+
+def crack(
+    ct: str,
+    max_width: int = 12,
+    restarts: int = 200,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    exhaustive: bool = False,
+) -> Tuple[List[Tuple[str, float]], Columnar]:
+    """Recover the key of an English Columnar ciphertext.
+
+    Args:
+        ct (str): The ciphertext.
+        max_width (int, optional): The longest key tried. Defaults to 12.
+        restarts (int, optional): The most orders climbed from for each
+            width. Defaults to 200.
+        seed (int, optional): Seed for the random swaps. Defaults to None.
+        workers (int, optional): The number of processes to share the key
+            widths between. Defaults to None, trying them all in this
+            process.
+        exhaustive (bool, optional): Whether to try every order of the
+            columns for keys up to 9 wide, which finds the best scoring
+            order for certain, instead of climbing. The orders are shared
+            between the workers by the column read first. Defaults to False.
+
+    Returns:
+        Tuple[List[Tuple[str, float]], Columnar]: The best key found for each
+            width with its quadgram score per letter, best first, and a
+            machine set up with the best of them.
+    """
+    ct = ct.upper()
+    tasks = []
+    for width in range(2, max(min(max_width, len(ct), 26), 2) + 1):
+        if exhaustive and width <= _EXHAUSTIVE_WIDTH:
+            tasks.extend(
+                (_exhaust_width, ct, width, first) for first in range(width)
+            )
+        else:
+            width_seed = None if seed is None else seed + width
+            tasks.append((_solve_width, ct, width, restarts, width_seed))
+
+    found = _map(_run_task, tasks, workers)
+
+    # The best order for each width, from however many tasks tried it.
+    best = {}
+    for order, score in found:
+        if len(order) not in best or score > best[len(order)][1]:
+            best[len(order)] = order, score
+    keys = [_key(order) for order, _ in best.values()]
+    ranked = sorted(
+        ((key, _quadgram_score(ct, key)) for key in keys),
+        key=lambda key: -key[1],
+    )
+    return ranked, Columnar(ranked[0][0])
+
+
+def _run_task(task, *args):
+    # Tasks climb or exhaust a width, and are shared between workers alike.
+    return task(*args)
+
+
+def _solve_width(
+    ct: str, width: int, restarts: int, seed: Optional[int]
+) -> Tuple[List[int], float]:
+    columns = _Columns(ct, width)
+    rng = random.Random(seed)
+    best_order = list(range(width))
+    rng.shuffle(best_order)
+    best_score = columns.climb(best_order)
+    stale = 0
+    for _ in range(restarts - 1):
+        order = best_order[:]
+        shake = rng.randint(_SHAKE_SWAPS, max(_SHAKE_SWAPS, width // 2))
+        for _ in range(shake):
+            i, j = rng.sample(range(width), 2)
+            order[i], order[j] = order[j], order[i]
+        score = columns.climb(order)
+        if score > best_score:
+            best_order, best_score, stale = order, score, 0
+        else:
+            stale += 1
+            if stale == _PATIENCE:
+                break
+    return best_order, best_score
+
+
+def _exhaust_width(ct: str, width: int, first: int) -> Tuple[List[int], float]:
+    return _Columns(ct, width).exhaust(first)
+
+
+def _key(order: List[int]) -> str:
+    # A key whose letters sort into the order its columns are read in.
+    key = [""] * len(order)
+    for rank, col in enumerate(order):
+        key[col] = fitness.ALPHA[rank]
+    return "".join(key)
+
+
+def _quadgram_score(ct: str, key: str) -> float:
+    letters = fitness.indices(Columnar(key).decipher(ct)[:_SCORE_SAMPLE])
+    return fitness.score(letters) / max(len(letters), 1)
+
+
+@lru_cache(maxsize=None)
+def _digram_table() -> List[float]:
+    # The digram table with a 27th symbol for everything but letters. A
+    # digram with such a character in it scores as much as an English digram
+    # does on average, so that moving the other characters around neither
+    # helps nor hurts a key.
+    table = fitness.ngram_table(2)
+    mean = sum(10**score * score for score in table)
+    full = [mean] * 27**2
+    for code, score in enumerate(table):
+        full[code // 26 * 27 + code % 26] = score
+    return full
+
+
+class _Columns:
+    def __init__(self, ct: str, width: int):
+        idx = fitness._letter_indices()
+        self.codes = [idx.get(char, _OTHER) for char in ct]
+        self.width = width
+
+        # The first len(ct) % width columns of the grid are a row longer.
+        self.lengths = [
+            len(range(col, len(ct), width)) for col in range(width)
+        ]
+        # How many rows of each column are scored against the next one, the
+        # last column against the first one a row down.
+        self.counts = [
+            min(self.lengths[col + 1], _SCORE_ROWS) for col in range(width - 1)
+        ]
+        self.counts.append(
+            min(self.lengths[-1], self.lengths[0] - 1, _SCORE_ROWS)
+        )
+        self.pairs = _Pairs(self.codes)
+
+    def starts(self, order: List[int]) -> List[int]:
+        """Where each column's block starts in the ciphertext."""
+        starts = [0] * self.width
+        start = 0
+        for col in order:
+            starts[col] = start
+            start += self.lengths[col]
+        return starts
+
+    def score(self, starts: List[int]) -> float:
+        """Score a key by the digrams across every pair of neighbouring
+        columns."""
+        return sum(
+            map(
+                self.pairs.__getitem__,
+                zip(starts, starts[1:] + [starts[0] + 1], self.counts),
+            )
+        )
+
+    def climb(self, order: List[int]) -> float:
+        """Swap columns of the order, and move runs of them elsewhere, in
+        place while that improves its score."""
+        score = self.score(self.starts(order))
+        improved = True
+        while improved:
+            improved = False
+            for new_order in _moves(order):
+                new_score = self.score(self.starts(new_order))
+                if new_score > score:
+                    order[:] = new_order
+                    score = new_score
+                    improved = True
+        return score
+
+    def exhaust(self, first: int) -> Tuple[List[int], float]:
+        """Find the best scoring of every order that reads the given column
+        first."""
+        width, lengths, pairs = self.width, self.lengths, self.pairs
+        order = [first] + [col for col in range(width) if col != first]
+        starts = self.starts(order)
+        # The score across each column and the next one, and which of these
+        # change when two columns swap places.
+        terms = [self._term(starts, col) for col in range(width)]
+        touched = [
+            [
+                sorted({(a - 1) % width, a, (b - 1) % width, b})
+                for b in range(width)
+            ]
+            for a in range(width)
+        ]
+        following = [(col + 1) % width for col in range(width)]
+        wraps = [0] * (width - 1) + [1]
+        counts = self.counts
+
+        score = best_score = sum(terms)
+        best_order = order[:]
+        for rank in _plain_changes(width - 1):
+            # The first column stays where it is.
+            rank += 1
+            a, b = order[rank], order[rank + 1]
+            order[rank], order[rank + 1] = b, a
+            starts[b] = starts[a]
+            starts[a] = starts[b] + lengths[b]
+            for col in touched[a][b]:
+                term = pairs[
+                    starts[col],
+                    starts[following[col]] + wraps[col],
+                    counts[col],
+                ]
+                score += term - terms[col]
+                terms[col] = term
+            if score > best_score:
+                best_order, best_score = order[:], score
+
+        # Summed afresh, free of the rounding of all the updates.
+        return best_order, self.score(self.starts(best_order))
+
+    def _term(self, starts: List[int], col: int) -> float:
+        if col == self.width - 1:
+            return self.pairs[starts[col], starts[0] + 1, self.counts[col]]
+        return self.pairs[starts[col], starts[col + 1], self.counts[col]]
+
+
+class _Pairs(dict):
+    # The score of the digrams across the first rows of two blocks side by
+    # side, by where each block starts and how many rows are scored, worked
+    # out the first time it is needed.
+    def __init__(self, codes: List[int]):
+        super().__init__()
+        self.codes = codes
+        self.table = _digram_table()
+
+    def __missing__(self, key: Tuple[int, int, int]) -> float:
+        left, right, count = key
+        codes, table = self.codes, self.table
+        score = sum(
+            table[codes[left + row] * 27 + codes[right + row]]
+            for row in range(count)
+        )
+        self[key] = score
+        return score
+
+
+def _moves(order: List[int]) -> Iterator[List[int]]:
+    # Every order one swap of two columns away, then every order with a run
+    # of columns moved elsewhere, which keeps columns already in the right
+    # order together, and last every order with each block moved the same
+    # number of columns along the grid, which fixes the rows starting at the
+    # wrong column.
+    width = len(order)
+    for i in range(width):
+        for j in range(i + 1, width):
+            new_order = order[:]
+            new_order[i], new_order[j] = new_order[j], new_order[i]
+            yield new_order
+    for length in range(1, width):
+        for i in range(width - length + 1):
+            run, rest = order[i : i + length], order[:i] + order[i + length :]
+            for j in range(len(rest) + 1):
+                if j != i:
+                    yield rest[:j] + run + rest[j:]
+    for shift in range(1, width):
+        yield [(col + shift) % width for col in order]
+
+
+@lru_cache(maxsize=None)
+def _plain_changes(length: int) -> List[int]:
+    # The places at which neighbours are swapped to step through every order
+    # of length things, each once (Steinhaus-Johnson-Trotter). The last thing
+    # sweeps from one end to the other and back, and between sweeps the rest
+    # take a step through their own plain changes.
+    if length < 2:
+        return []
+    changes = []
+    for step, change in enumerate(_plain_changes(length - 1) + [None]):
+        if step % 2:
+            changes.extend(range(length - 1))
+        else:
+            changes.extend(range(length - 2, -1, -1))
+        if change is not None:
+            # Past the last thing if it has swept to the start.
+            changes.append(change if step % 2 else change + 1)
+    return changes
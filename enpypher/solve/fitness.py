@@ -0,0 +1,149 @@
+"""Scoring of candidate plaintexts by how closely they resemble English.
+
+Texts are scored as letter indices, 0 to 25, so that the solvers can work on
+lists of integers rather than strings. An n-gram of indices is looked up by
+its code, the indices read as the digits of a base 26 number.
+"""
+
+import math
+import string
+from functools import lru_cache
+from typing import List, Sequence
+
+from enpypher import constants
+
+ALPHA = string.ascii_uppercase
+
+_NGRAM_FILES = {2: "bigrams.txt", 4: "quadgrams.txt"}
+
+# Chance given to an n-gram never seen, relative to one seen a single time.
+_UNSEEN = 0.01
+
+
+def indices(text: str) -> List[int]:
+    """Turn the letters of a text into indices, leaving out everything else.
+
+    Args:
+        text (str): The text to convert.
+
+    Returns:
+        List[int]: The index in the alphabet of each letter.
+    """
+    idx = _letter_indices()
+    return [idx[char] for char in text.upper() if char in idx]
+
+
+def codes(letters: List[int], n: int) -> List[int]:
+    """Find the code of every n-gram in a list of letter indices.
+
+    Args:
+        letters (List[int]): The letter indices.
+        n (int): The length of each n-gram.
+
+    Returns:
+        List[int]: The code of the n-gram starting at each position.
+    """
+    size = 26 ** (n - 1)
+    found = []
+    code = 0
+    for i, letter in enumerate(letters):
+        code = (code % size) * 26 + letter
+        if i >= n - 1:
+            found.append(code)
+    return found
+
+
+@lru_cache(maxsize=None)
+def ngram_table(n: int) -> List[float]:
+    """The log probability of every n-gram in English, indexed by its code.
+
+    Args:
+        n (int): The length of the n-grams, 2 or 4.
+
+    Returns:
+        List[float]: The base 10 log probability of each n-gram.
+    """
+    if n not in _NGRAM_FILES:
+        raise ValueError(f"no table of {n} letter sequences")
+
+    # Only needed once a table is loaded, and slow to import.
+    from importlib import resources
+
+    data = resources.files(__package__).joinpath("data", _NGRAM_FILES[n])
+    counts = {}
+    for line in data.read_text(encoding="ascii").splitlines():
+        if line and not line.startswith("#"):
+            gram, count = line.split()
+            counts[gram] = int(count)
+
+    total = sum(counts.values())
+    table = [math.log10(_UNSEEN / total)] * 26**n
+    idx = _letter_indices()
+    for gram, count in counts.items():
+        code = 0
+        for char in gram:
+            code = code * 26 + idx[char]
+        table[code] = math.log10(count / total)
+    return table
+
+
+def score(letters: List[int], n: int = 4) -> float:
+    """Score a text by the log probability of its n-grams.
+
+    Args:
+        letters (List[int]): The letter indices of the text.
+        n (int, optional): The length of the n-grams. Defaults to 4.
+
+    Returns:
+        float: The score, higher being more like English.
+    """
+    return sum(map(ngram_table(n).__getitem__, codes(letters, n)))
+
+
+def letter_frequencies(alpha: str = ALPHA) -> List[float]:
+    """The share of English letters taken by each letter of an alphabet,
+    counting only letters in the alphabet.
+
+    Args:
+        alpha (str, optional): The alphabet. Defaults to ALPHA.
+
+    Returns:
+        List[float]: The frequency of each letter, summing to 1.
+    """
+    missing = [char for char in alpha if char not in constants._LETTER_FREQ]
+    if missing:
+        raise ValueError(f"no English frequency for {''.join(missing)!r}")
+    freqs = [constants._LETTER_FREQ[char] for char in alpha]
+    return [freq / sum(freqs) for freq in freqs]
+
+
+def chi_squares(
+    counts: Sequence[int], expected: Sequence[float]
+) -> List[float]:
+    """Compare letter counts with expected frequencies under every rotation.
+
+    Args:
+        counts (Sequence[int]): How often each letter occurs.
+        expected (Sequence[float]): The expected frequency of each letter.
+
+    Returns:
+        List[float]: For each rotation s, the chi-square statistic of the
+            counts s places on from each letter against its frequency.
+    """
+    size = len(counts)
+    total = sum(counts)
+    if not total:
+        return [0.0] * size
+    means = [total * freq for freq in expected]
+    return [
+        sum(
+            (counts[(i + s) % size] - mean) ** 2 / mean
+            for i, mean in enumerate(means)
+        )
+        for s in range(size)
+    ]
+
+
+@lru_cache(maxsize=None)
+def _letter_indices():
+    return {char: i for i, char in enumerate(ALPHA)}
@@ -0,0 +1,128 @@
+"""Recovery of a Monoalphabetic key by hill climbing over key swaps."""
+
+import random
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from enpypher import constants
+from enpypher.monoalphabetic import Monoalphabetic
+from enpypher.solve import fitness
+
+# The least and most random swaps made to the best key before climbing again.
+_SHAKE_SWAPS = (3, 6)
+
+
+def crack(
+    ct: str, restarts: int = 30, seed: Optional[int] = None
+) -> Monoalphabetic:
+    """Recover the key of an English Monoalphabetic ciphertext.
+
+    Pairs of ciphertext letters are swapped for as long as a swap makes the
+    deciphered text score better by quadgrams, starting from the key matching
+    letter frequencies. The best key found is then shaken up by a few random
+    swaps and climbed from again, to get out of local optima.
+
+    Args:
+        ct (str): The ciphertext, enciphered with the English alphabet.
+        restarts (int, optional): The number of keys to climb from. Defaults
+            to 30.
+        seed (int, optional): Seed for the random swaps. Defaults to None.
+
+    Returns:
+        Monoalphabetic: A machine set up with the best key found.
+    """
+    climber = _Climber(fitness.indices(ct))
+    rng = random.Random(seed)
+    best_key = climber.frequency_key()
+    best_score = climber.climb(best_key)
+    for _ in range(restarts - 1):
+        key = best_key[:]
+        for _ in range(rng.randint(*_SHAKE_SWAPS)):
+            a, b = rng.sample(range(26), 2)
+            key[a], key[b] = key[b], key[a]
+        score = climber.climb(key)
+        if score > best_score:
+            best_key, best_score = key, score
+
+    # best_key deciphers each ciphertext letter, the machine's key enciphers.
+    sub_alpha = [""] * 26
+    for c, p in enumerate(best_key):
+        sub_alpha[p] = fitness.ALPHA[c]
+    return Monoalphabetic("".join(sub_alpha))
+
+
+class _Climber:
+    def __init__(self, letters: List[int]):
+        self.letters = letters
+        self.table = fitness.ngram_table(4)
+
+        # Each distinct quadgram of the ciphertext is scored once and
+        # weighted by how often it occurs.
+        counts = Counter(zip(letters, letters[1:], letters[2:], letters[3:]))
+        self.grams = list(counts)
+        self.counts = list(counts.values())
+
+        # Swapping the plaintext letters of two ciphertext letters changes the
+        # code of a quadgram by the difference between the letters, times the
+        # weight of the places each ciphertext letter takes in the quadgram.
+        # Those changes are worked out once for every pair of letters.
+        weights: List[Dict[int, int]] = [{} for _ in range(26)]
+        for t, gram in enumerate(self.grams):
+            for place, c in enumerate(gram):
+                weights[c][t] = weights[c].get(t, 0) + 26 ** (3 - place)
+
+        self.swaps: List[Tuple[int, int, List[Tuple[int, int, int]]]] = []
+        for a in range(26):
+            for b in range(a + 1, 26):
+                changes = dict(weights[a])
+                for t, weight in weights[b].items():
+                    changes[t] = changes.get(t, 0) - weight
+                changes = [
+                    (t, change, self.counts[t])
+                    for t, change in changes.items()
+                    if change
+                ]
+                if changes:
+                    self.swaps.append((a, b, changes))
+
+    def frequency_key(self) -> List[int]:
+        # Deciphers the most common ciphertext letters as the most common
+        # English letters.
+        english = sorted(
+            range(26), key=lambda p: -constants._LETTER_FREQ[fitness.ALPHA[p]]
+        )
+        counts = Counter(self.letters)
+        cipher = sorted(range(26), key=lambda c: -counts[c])
+        key = [0] * 26
+        for c, p in zip(cipher, english):
+            key[c] = p
+        return key
+
+    def climb(self, key: List[int]) -> float:
+        """Swap letters of the key in place while that improves its score."""
+        table = self.table
+        codes = [
+            ((key[a] * 26 + key[b]) * 26 + key[c]) * 26 + key[d]
+            for a, b, c, d in self.grams
+        ]
+
+        improved = True
+        while improved:
+            improved = False
+            for a, b, changes in self.swaps:
+                step = key[b] - key[a]
+                delta = 0.0
+                for t, change, count in changes:
+                    code = codes[t]
+                    delta += count * (
+                        table[code + step * change] - table[code]
+                    )
+                if delta > 0:
+                    for t, change, _ in changes:
+                        codes[t] += step * change
+                    key[a], key[b] = key[b], key[a]
+                    improved = True
+
+        return sum(
+            count * table[code] for count, code in zip(self.counts, codes)
+        )
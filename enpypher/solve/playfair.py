@@ -0,0 +1,328 @@
+"""Recovery of a Playfair key square by simulated annealing.
+
+Each chain wanders from a random square, taking every change that scores
+better and some that score worse, and starts again from another random square
+once it has found nothing better in a while.
+
+The square is kept as two flat arrays, the letter in each cell and the cell
+of each letter, so that swapping letters, rows or columns, or reflecting the
+square, only writes the cells that change. Where a digram of the ciphertext
+deciphers to depends only on the cells of its two letters, so after a change
+only the digrams with a letter that moved, or that decipher to a cell that
+changed, are deciphered again. The plaintext is then scored by quadgrams put
+together from the deciphered digrams.
+
+Rotating the rows or columns of a square deciphers the same way, so squares
+found are rotated to put A in the top left corner before they are compared. A
+chain that climbs back to a square, up to rotation, that it has already
+settled on starts again straight away rather than exploring it again.
+"""
+
+import math
+import random
+from operator import add
+from typing import Dict, List, Optional, Set, Tuple
+
+from enpypher.playfair import Playfair
+from enpypher.solve import _map, fitness
+
+# The letters of the square, by their index in the English alphabet, with I
+# standing in for J.
+_SQUARE_LETTERS = [i for i, char in enumerate(fitness.ALPHA) if char != "J"]
+
+# Letters deciphered to score each key.
+_SCORE_SAMPLE = 1 << 9
+
+# The temperature of the chains, per quadgram scored.
+_TEMPERATURE = 0.025
+
+# A chain starts again from a random square after this many changes in a row
+# fail to find a better one.
+_PATIENCE = 15000
+
+# How many of every hundred changes swap two letters; the rest are spread
+# evenly over swapping rows, swapping columns and the three reflections.
+_LETTER_SWAPS = 90
+
+
+def crack(
+    ct: str,
+    chains: int = 4,
+    steps: int = 100000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Tuple[List[Tuple[str, float]], Playfair]:
+    """Recover the key square of an English Playfair ciphertext.
+
+    Args:
+        ct (str): The ciphertext.
+        chains (int, optional): The number of squares annealed from random
+            starts. Defaults to 4.
+        steps (int, optional): The number of changes tried in each chain.
+            Defaults to 100000.
+        seed (int, optional): Seed for the random changes. Defaults to None.
+        workers (int, optional): The number of processes to share the chains
+            between. Defaults to None, running them all in this process.
+
+    Returns:
+        Tuple[List[Tuple[str, float]], Playfair]: The best square found by
+            each chain, counting squares the same under rotation once, with
+            its quadgram score per letter, best first, and a machine set up
+            with the best of them.
+    """
+    letters = fitness.indices(ct.upper().replace("J", "I"))
+    letters = letters[: min(len(letters), _SCORE_SAMPLE) // 2 * 2]
+    if len(letters) < 4:
+        raise ValueError("the ciphertext needs at least two digrams")
+    if steps < 1:
+        raise ValueError("each chain needs at least one step")
+
+    seeds = [None if seed is None else seed + chain for chain in range(chains)]
+    found = _map(
+        _anneal,
+        [(letters, steps, chain_seed) for chain_seed in seeds],
+        workers,
+    )
+
+    quadgrams = len(letters) - 3
+    best: Dict[str, float] = {}
+    for key, score in found:
+        best[key] = max(best.get(key, score), score)
+    ranked = sorted(
+        ((key, score / quadgrams) for key, score in best.items()),
+        key=lambda key: -key[1],
+    )
+    return ranked, Playfair(ranked[0][0])
+
+
+def _anneal(
+    letters: List[int], steps: int, seed: Optional[int]
+) -> Tuple[str, float]:
+    rng = random.Random(seed)
+    temperature = _TEMPERATURE * (len(letters) - 3)
+    best_key = ""
+    best_score = -math.inf
+    # The squares earlier runs settled on, rotated to put A first.
+    settled: Set[str] = set()
+    run_key = ""
+    stale = _PATIENCE
+    for _ in range(steps):
+        if stale == _PATIENCE:
+            # Start again from a random square.
+            if run_key:
+                settled.add(run_key)
+            square = _SQUARE_LETTERS[:]
+            rng.shuffle(square)
+            deciphered = _Deciphered(letters, square)
+            score = run_score = deciphered.score()
+            run_key = _canonical_key(square)
+            stale = 0
+
+        change = _change(rng)
+        deciphered.change(*change)
+        new_score = deciphered.score()
+        if new_score >= score or rng.random() < math.exp(
+            (new_score - score) / temperature
+        ):
+            score = new_score
+        else:
+            # Every change undoes itself when made again.
+            deciphered.change(*change)
+
+        if score > run_score:
+            run_score, stale = score, 0
+            run_key = _canonical_key(square)
+            if run_key in settled:
+                # Back on a square an earlier run has already explored.
+                stale = _PATIENCE
+            if score > best_score:
+                best_key, best_score = run_key, score
+        else:
+            stale += 1
+
+    if not best_key:
+        # The random square the chain started from was never bettered.
+        best_key, best_score = run_key, run_score
+    return best_key, best_score
+
+
+def _change(rng: random.Random) -> Tuple[str, int, int]:
+    # A random change to the square: its kind and, for swaps, what is
+    # swapped.
+    if rng.randrange(100) < _LETTER_SWAPS:
+        a, b = rng.sample(range(25), 2)
+        return "cells", a, b
+    kind = rng.choice(("rows", "columns", "flip rows", "flip columns", "turn"))
+    a, b = rng.sample(range(5), 2)
+    return kind, a, b
+
+
+def _canonical_key(square: List[int]) -> str:
+    # The square rotated to put A in the top left corner, which deciphers
+    # the same way.
+    row, col = divmod(square.index(0), 5)
+    return "".join(
+        fitness.ALPHA[square[(r + row) % 5 * 5 + (c + col) % 5]]
+        for r in range(5)
+        for c in range(5)
+    )
+
+
+def _decipher_cells() -> List[Tuple[int, int]]:
+    # The cells a digram deciphers to, by the cells of its letters, which
+    # are the same for every square.
+    rule = []
+    for first in range(25):
+        r1, c1 = divmod(first, 5)
+        for second in range(25):
+            r2, c2 = divmod(second, 5)
+            if r1 == r2:
+                rule.append((r1 * 5 + (c1 - 1) % 5, r2 * 5 + (c2 - 1) % 5))
+            elif c1 == c2:
+                rule.append(((r1 - 1) % 5 * 5 + c1, (r2 - 1) % 5 * 5 + c2))
+            else:
+                rule.append((r1 * 5 + c2, r2 * 5 + c1))
+    return rule
+
+
+_DECIPHER_CELLS = _decipher_cells()
+
+# The parts of the codes of the quadgrams made up of a deciphered digram and
+# the next one, and of the quadgrams starting halfway through it, by the
+# code of the digram.
+_HIGH = [code * 676 for code in range(676)]
+_MIDDLE = [code * 26 for code in range(676)]
+_TAIL = [code % 26 * 17576 for code in range(676)]
+_HEAD = [code // 26 for code in range(676)]
+
+
+class _Deciphered:
+    def __init__(self, letters: List[int], square: List[int]):
+        self.square = square
+        self.cell = [0] * 26
+        for cell, letter in enumerate(square):
+            self.cell[letter] = cell
+        self.table = fitness.ngram_table(4)
+
+        # Each distinct digram of the ciphertext, and which of them make up
+        # the text.
+        ids: Dict[Tuple[int, int], int] = {}
+        sequence = [
+            ids.setdefault(digram, len(ids))
+            for digram in zip(letters[::2], letters[1::2])
+        ]
+        self.digrams = list(ids)
+        self.with_letter: List[List[int]] = [[] for _ in range(26)]
+        for d, (first, second) in enumerate(self.digrams):
+            self.with_letter[first].append(d)
+            if second != first:
+                self.with_letter[second].append(d)
+
+        self.sequence = sequence
+
+        # For each digram, the cells it deciphers to, the digrams deciphering
+        # to each cell, and the code of the digram it deciphers to.
+        self.to_cells: List[Optional[Tuple[int, int]]] = [None] * len(
+            self.digrams
+        )
+        self.at_cell: List[Set[int]] = [set() for _ in range(25)]
+        self.codes = [0] * len(self.digrams)
+        self._decipher(range(len(self.digrams)))
+
+    def change(self, kind: str, a: int, b: int) -> None:
+        """Change the square in place and decipher again the digrams the
+        change touches."""
+        square, cell = self.square, self.cell
+        cells, targets = _moves(kind, a, b)
+        letters = [square[c] for c in cells]
+        for c, letter in zip(targets, letters):
+            square[c] = letter
+            cell[letter] = c
+
+        touched = set()
+        for c in cells:
+            touched.update(self.with_letter[square[c]])
+            touched.update(self.at_cell[c])
+        self._decipher(touched)
+
+    def score(self) -> float:
+        """Score the deciphered text by its quadgrams."""
+        # A quadgram starts at every digram but the last, and halfway through
+        # every digram but the last two.
+        table = self.table
+        codes = list(map(self.codes.__getitem__, self.sequence))
+        whole = sum(
+            map(
+                table.__getitem__,
+                map(add, map(_HIGH.__getitem__, codes[:-1]), codes[1:]),
+            )
+        )
+        halves = sum(
+            map(
+                table.__getitem__,
+                map(
+                    add,
+                    map(
+                        add,
+                        map(_TAIL.__getitem__, codes[:-2]),
+                        map(_MIDDLE.__getitem__, codes[1:-1]),
+                    ),
+                    map(_HEAD.__getitem__, codes[2:]),
+                ),
+            )
+        )
+        return whole + halves
+
+    def _decipher(self, digrams) -> None:
+        square, cell = self.square, self.cell
+        at_cell, to_cells = self.at_cell, self.to_cells
+        for d in digrams:
+            first, second = self.digrams[d]
+            cells = _DECIPHER_CELLS[cell[first] * 25 + cell[second]]
+            old = to_cells[d]
+            if cells != old:
+                if old is not None:
+                    at_cell[old[0]].discard(d)
+                    at_cell[old[1]].discard(d)
+                at_cell[cells[0]].add(d)
+                at_cell[cells[1]].add(d)
+                to_cells[d] = cells
+            self.codes[d] = square[cells[0]] * 26 + square[cells[1]]
+
+
+def _moves(kind: str, a: int, b: int) -> Tuple[List[int], List[int]]:
+    # The cells whose letters a change moves, and where each goes.
+    if kind == "cells":
+        return [a, b], [b, a]
+    if kind == "rows":
+        cells = [a * 5 + c for c in range(5)] + [b * 5 + c for c in range(5)]
+    elif kind == "columns":
+        cells = [r * 5 + a for r in range(5)] + [r * 5 + b for r in range(5)]
+    else:
+        return _REFLECTIONS[kind]
+    return cells, cells[5:] + cells[:5]
+
+
+def _reflections() -> Dict[str, Tuple[List[int], List[int]]]:
+    # The cells moved by each reflection of the square, which are the ones
+    # off the middle row, column or diagonal, and where each goes.
+    reflections = {}
+    for kind in ("flip rows", "flip columns", "turn"):
+        moves = []
+        for c in range(25):
+            row, col = divmod(c, 5)
+            if kind == "flip rows":
+                target = (4 - row) * 5 + col
+            elif kind == "flip columns":
+                target = row * 5 + 4 - col
+            else:
+                # Turned over along the diagonal.
+                target = col * 5 + row
+            if target != c:
+                moves.append((c, target))
+        cells, targets = zip(*moves)
+        reflections[kind] = list(cells), list(targets)
+    return reflections
+
+
+_REFLECTIONS = _reflections()
@@ -0,0 +1,71 @@
+"""Recovery of the number of rails, and offset, of a rail fence cipher.
+
+Only the start of the plaintext is deciphered for each candidate: the places
+each rail takes in the ciphertext follow from its length alone, so the first
+letters of every rail are gathered straight into place and scored.
+"""
+
+from typing import List, Optional, Tuple
+
+from enpypher.railfence import Railfence
+from enpypher.solve import _map, fitness
+
+# Characters deciphered to score each candidate.
+_SCORE_SAMPLE = 1 << 12
+
+
+def crack(
+    ct: str,
+    max_rails: int = 20,
+    offsets: bool = False,
+    workers: Optional[int] = None,
+) -> List[Tuple[int, int, float]]:
+    """Rank the keys of an English rail fence ciphertext.
+
+    Args:
+        ct (str): The ciphertext.
+        max_rails (int, optional): The most rails tried. Defaults to 20.
+        offsets (bool, optional): Whether to try every offset into the
+            zig-zag as well. Defaults to False.
+        workers (int, optional): The number of processes to share the
+            candidates between. Defaults to None, trying them all in this
+            process.
+
+    Returns:
+        List[Tuple[int, int, float]]: Each number of rails and offset with its
+            quadgram score per letter, best first.
+    """
+    candidates = [
+        (rails, offset)
+        for rails in range(2, max(min(max_rails, len(ct)), 2) + 1)
+        for offset in (range(2 * (rails - 1)) if offsets else [0])
+    ]
+    found = _map(
+        _score,
+        [(ct, candidate) for candidate in candidates],
+        workers,
+        chunksize=16,
+    )
+    return sorted(found, key=lambda key: -key[2])
+
+
+def _score(ct: str, candidate: Tuple[int, int]) -> Tuple[int, int, float]:
+    rails, offset = candidate
+    letters = fitness.indices(_decipher_start(ct, rails, offset))
+    return rails, offset, fitness.score(letters) / max(len(letters), 1)
+
+
+def _decipher_start(ct: str, rails: int, offset: int) -> str:
+    # Each rail's first letters within the sample sit at the start of its
+    # block of the ciphertext, every len(places)th letter for each stride.
+    length = min(len(ct), _SCORE_SAMPLE)
+    pt = [""] * length
+    start = 0
+    for places, stop in Railfence(rails, offset=offset)._rails(len(ct)):
+        for n, place in enumerate(places):
+            count = len(range(place.start, length, place.step))
+            pt[place.start : length : place.step] = ct[
+                start + n : start + n + count * len(places) : len(places)
+            ]
+        start = stop
+    return "".join(pt)
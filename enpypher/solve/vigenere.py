@@ -0,0 +1,126 @@
+"""Recovery of a Vigenere key from ciphertext alone.
+
+The period is estimated by a Kasiski examination and by the index of
+coincidence of the columns each candidate period splits the text into, then
+every column is solved as a shift cipher by rotating its letter counts.
+"""
+
+import re
+import string
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from enpypher.solve import fitness
+from enpypher.vigenere import Vigenere
+
+# Letters looked at when estimating the period; this many is plenty, and
+# keeps the estimate quick on long texts.
+_PERIOD_SAMPLE = 1 << 15
+
+# Letters deciphered to compare the keys found for different periods.
+_SCORE_SAMPLE = 1 << 12
+
+# How many of the best periods by each test are solved.
+_PERIOD_CANDIDATES = 4
+
+
+def crack(
+    ct: str, max_period: int = 20, alpha: str = string.ascii_uppercase
+) -> Tuple[List[Tuple[str, float]], Vigenere]:
+    """Recover the key of an English Vigenere ciphertext.
+
+    Args:
+        ct (str): The ciphertext.
+        max_period (int, optional): The longest key tried. Defaults to 20.
+        alpha (str, optional): The plaintext alphabet. Defaults to
+            string.ascii_uppercase.
+
+    Returns:
+        Tuple[List[Tuple[str, float]], Vigenere]: Each key found with its
+            quadgram score per letter, best first, and a machine set up with
+            the best of them.
+    """
+    letters = re.sub(f"[^{re.escape(alpha)}]+", "", ct.upper())
+    expected = fitness.letter_frequencies(alpha)
+    sample = letters[:_PERIOD_SAMPLE]
+    periods = range(1, max(min(max_period, len(sample) // 2), 1) + 1)
+
+    ics = _column_ics(sample, periods, len(alpha))
+    lifts = _kasiski(sample, periods)
+    candidates = set(sorted(periods, key=ics.get)[-_PERIOD_CANDIDATES:])
+    candidates.update(sorted(periods, key=lifts.get)[-_PERIOD_CANDIDATES:])
+
+    keys = set()
+    for period in candidates:
+        key = ""
+        for column in range(period):
+            counts = Counter(letters[column::period])
+            scores = fitness.chi_squares(
+                [counts[char] for char in alpha], expected
+            )
+            key += alpha[min(range(len(alpha)), key=scores.__getitem__)]
+        keys.add(_shortest_repeat(key))
+
+    ranked = sorted(
+        ((key, _score(letters[:_SCORE_SAMPLE], key, alpha)) for key in keys),
+        key=lambda found: -found[1],
+    )
+    return ranked, Vigenere(ranked[0][0], alpha)
+
+
+def _column_ics(letters: str, periods: range, size: int) -> Dict[int, float]:
+    # The mean index of coincidence of the columns for each period, with each
+    # column's letters counted once.
+    ics = {}
+    for period in periods:
+        total = 0.0
+        for column in range(period):
+            counts = Counter(letters[column::period])
+            length = sum(counts.values())
+            if length > 1:
+                phio = sum(freq * (freq - 1) for freq in counts.values())
+                total += size * phio / (length * (length - 1))
+        ics[period] = total / period
+    return ics
+
+
+def _kasiski(letters: str, periods: range) -> Dict[int, float]:
+    # How much more often than by chance each period divides the distances
+    # between repeated trigrams. Trigrams are found by a rolling hash of
+    # their letters.
+    last: Dict[int, int] = {}
+    distances: Counter = Counter()
+    code = 0
+    for i, char in enumerate(letters):
+        code = (code << 16 | ord(char)) & 0xFFFFFFFFFFFF
+        if i >= 2:
+            if code in last:
+                distances[i - last[code]] += 1
+            last[code] = i
+
+    total = sum(distances.values())
+    if not total:
+        return {period: 0.0 for period in periods}
+    return {
+        period: period
+        * sum(distances[d] for d in range(period, len(letters) + 1, period))
+        / total
+        for period in periods
+    }
+
+
+def _shortest_repeat(key: str) -> str:
+    # A key found for a multiple of the period repeats the real key.
+    for length in range(1, len(key)):
+        if (
+            len(key) % length == 0
+            and key[:length] * (len(key) // length) == key
+        ):
+            return key[:length]
+    return key
+
+
+def _score(letters: str, key: str, alpha: str) -> float:
+    pt = Vigenere(key, alpha).decipher(letters)
+    found = fitness.indices(pt)
+    return fitness.score(found) / max(len(found), 1)
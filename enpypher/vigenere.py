@@ -1,9 +1,18 @@
+import io
+import re
 import string
+from typing import Dict, List, Tuple
 
+from enpypher import cipher_machine
 from enpypher.cipher_machine import CipherMachine
 
+# Shorter texts are shifted a letter at a time, which is quicker for them.
+_STRIDED_MIN_LENGTH = 64
+
 
 class Vigenere(CipherMachine):
+    _engines = ("python", "numpy")
+
     def __init__(self, key: str, alpha=string.ascii_uppercase):
         """A Vigenère substitution cipher maps each letter from a plaintext alphabet to
         a letter in one of many substitution alphabets. A Vigenère object will take a
@@ -18,21 +27,139 @@ class Vigenere(CipherMachine):
         """
         super().__init__(key, alpha)
 
+    @classmethod
+    def crack(
+        cls, ct: str, max_period: int = 20, alpha=string.ascii_uppercase
+    ) -> Tuple[List[Tuple[str, float]], "Vigenere"]:
+        """Recover the key of an English ciphertext. The period is estimated
+        by a Kasiski examination and the index of coincidence of each
+        candidate's columns, then each column is solved by rotating its letter
+        counts against English letter frequencies.
+
+        Args:
+            ct (str): The ciphertext.
+            max_period (int, optional): The longest key tried. Defaults to 20.
+            alpha (str, optional): The plaintext alphabet. Defaults to
+                string.ascii_uppercase.
+
+        Returns:
+            Tuple[List[Tuple[str, float]], Vigenere]: Each key found with its
+                quadgram score per letter, best first, and a machine set up
+                with the best of them.
+        """
+        from enpypher.solve import vigenere
+
+        return vigenere.crack(ct, max_period, alpha)
+
     def _cipher(self, text, encipher):
-        text = text.upper()
+        return self._shift(
+            self._prepare_text(text, encipher), encipher, self.clean_key, 0
+        )[0]
+
+    def _cipher_batch(self, texts, encipher):
+        separator = cipher_machine._BATCH_SEPARATOR
+        if (
+            not texts
+            or not self.clean_key
+            or not self.alpha
+            or any(separator in text for text in texts)
+        ):
+            return super()._cipher_batch(texts, encipher)
+        # The separator is a control character, which is kept by the
+        # cleaning.
+        texts = self._prepare_text(separator.join(texts), encipher).split(
+            separator
+        )
+
+        # Every message starts at the first letter of the key, so after each
+        # one enough letters are put in to bring the key back round to it,
+        # between separators, and dropped again afterwards.
+        counts = self._batch_letters.sub("", separator.join(texts))
+        parts = []
+        for text, used in zip(texts, map(len, counts.split(separator))):
+            parts.append(text)
+            parts.append(
+                separator
+                + self.alpha[0] * (-used % len(self.clean_key))
+                + separator
+            )
+        joined = "".join(parts[:-1])
+        joined = self._shift(joined, encipher, self.clean_key, 0)[0]
+        case = str.upper if encipher else str.lower
+        return list(map(case, joined.split(separator)[::2]))
+
+    def _prepare_text(self, text: str, encipher: bool) -> str:
         if encipher:
-            text = self._clean_input(
+            return self._clean_input(
                 text, True, True, False, True, False, False, True, False
             )
+        return text.upper()
+
+    def _stream(self, chunks, encipher):
+        j = 0
+        for chunk in self._prepare_chunks(chunks, encipher):
+            text, j = self._shift(chunk, encipher, self.clean_key, j)
+            yield text
+
+    def _cipher_bytes(self, data, encipher):
+        return self._shift_bytes(
+            self._prepare_bytes(data, encipher), encipher, self.clean_key, 0
+        )[0]
+
+    def _stream_bytes(self, blocks, encipher):
+        j = 0
+        for block in blocks:
+            if isinstance(block, str):
+                block, j = self._shift(
+                    self._prepare_text(block, encipher),
+                    encipher,
+                    self.clean_key,
+                    j,
+                )
+            else:
+                block, j = self._shift_bytes(
+                    self._prepare_bytes(block, encipher),
+                    encipher,
+                    self.clean_key,
+                    j,
+                )
+            yield block
+
+    def _can_cipher_bytes(self, encipher):
+        return self.alpha.isascii()
+
+    def _prepare_bytes(self, data: bytes, encipher: bool) -> bytes:
+        if encipher:
+            return self._clean_bytes(
+                data, True, True, False, True, False, False, True, False
+            )
+        return data.upper()
+
+    def _prepare_chunks(self, chunks, encipher):
+        if encipher:
+            return self._stream_clean(
+                chunks, True, True, False, True, False, False, True, False
+            )
+        return map(str.upper, chunks)
 
+    def _shift(
+        self, text: str, encipher: bool, key: str, j: int
+    ) -> Tuple[str, int]:
         # Shift forward or back depending on which
         # encipher/decipher operation is selected.
+        # j is how many letters of the key have been used so far.
+        if self.engine == "numpy":
+            from enpypher import _numpy_engine
+
+            return _numpy_engine.shift(text, self.alpha, key, encipher, j)
+        if len(text) >= _STRIDED_MIN_LENGTH and key and self.alpha:
+            return self._shift_strided(text, encipher, key, j)
+
         direc = 1 if encipher else -1
         new_text = []
-        j = 0
         for char in text:
             if char in self.alpha:
-                key_let = self.clean_key[j % len(self.clean_key)]
+                key_let = key[j % len(key)]
                 new_text.append(
                     self.alpha[
                         (self.idx[char] + direc * self.idx[key_let])
@@ -43,7 +170,97 @@ class Vigenere(CipherMachine):
             else:
                 new_text.append(char)
 
-        return "".join(new_text)
+        return "".join(new_text), j
+
+    def _shift_strided(
+        self, text: str, encipher: bool, key: str, j: int
+    ) -> Tuple[str, int]:
+        # As in _shift_bytes, every len(key)th letter is translated in one go
+        # before the letters are put back between the other characters.
+        tables = self._translate_tables(encipher)
+        parts = self._non_alpha_runs.split(text)
+        letters = "".join(parts[::2])
+        if not letters:
+            return text, j
+
+        shifted = [""] * len(letters)
+        for r in range(min(len(key), len(letters))):
+            table = tables[key[(j + r) % len(key)]]
+            shifted[r :: len(key)] = letters[r :: len(key)].translate(table)
+
+        return self._merge_letters(parts, "".join(shifted)), j + len(letters)
+
+    @staticmethod
+    def _merge_letters(parts: List[str], letters: str) -> str:
+        # Puts new letters in place of the runs of letters at the even indices
+        # of a text split around its other characters.
+        if len(parts) == 1:
+            return letters
+        parts[::2] = map(io.StringIO(letters).read, map(len, parts[::2]))
+        return "".join(parts)
+
+    def _shift_bytes(
+        self, data: bytes, encipher: bool, key: str, j: int
+    ) -> Tuple[bytes, int]:
+        # The letters are pulled out of the text and every len(key)th letter,
+        # all shifted by the same key letter, is translated in one go before
+        # the letters are put back in place.
+        tables = self._shift_tables(encipher)
+        letters = data.translate(None, self._non_letters)
+        if not letters:
+            return data, j
+        if not key:
+            raise ValueError("the key has no letters from the alphabet")
+
+        shifted = bytearray(len(letters))
+        for r in range(min(len(key), len(letters))):
+            table = tables[key[(j + r) % len(key)]]
+            shifted[r :: len(key)] = letters[r :: len(key)].translate(table)
+
+        return (
+            self._merge_bytes(data, letters, bytes(shifted)),
+            j + len(letters),
+        )
+
+    def _merge_bytes(
+        self, data: bytes, letters: bytes, shifted: bytes
+    ) -> bytes:
+        # Puts shifted letters in place of the letters pulled out of data.
+        if len(letters) == len(data):
+            return shifted
+        # Splitting around the other characters leaves the runs of letters at
+        # the even indices, to be replaced by the shifted letters.
+        parts = self._non_letter_runs.split(data)
+        parts[::2] = map(io.BytesIO(shifted).read, map(len, parts[::2]))
+        return b"".join(parts)
+
+    def _shift_tables(self, encipher: bool) -> Dict[str, bytes]:
+        # bytes.translate tables shifting the alphabet by each letter.
+        if encipher not in self._byte_tables:
+            if not self.alpha.isascii():
+                raise ValueError("bytes need an ASCII alphabet")
+            alpha = self.alpha.encode("ascii")
+            direc = 1 if encipher else -1
+            self._byte_tables[encipher] = {
+                letter: bytes.maketrans(
+                    alpha, alpha[direc * i :] + alpha[: direc * i]
+                )
+                for i, letter in enumerate(self.alpha)
+            }
+        return self._byte_tables[encipher]
+
+    def _translate_tables(self, encipher: bool) -> Dict[str, dict]:
+        # str.translate tables shifting the alphabet by each letter.
+        if encipher not in self._str_tables:
+            direc = 1 if encipher else -1
+            self._str_tables[encipher] = {
+                letter: str.maketrans(
+                    self.alpha,
+                    self.alpha[direc * i :] + self.alpha[: direc * i],
+                )
+                for i, letter in enumerate(self.alpha)
+            }
+        return self._str_tables[encipher]
 
     def set_key(self, key: str):
         self.input_key = key
@@ -52,3 +269,23 @@ class Vigenere(CipherMachine):
     def set_alpha(self, alpha):
         super().set_alpha(alpha)
         self.idx = {char: i for i, char in enumerate(self.alpha)}
+
+        self._str_tables = {}
+        self._non_alpha_runs = (
+            re.compile(f"([^{re.escape(self.alpha)}]+)")
+            if self.alpha
+            else None
+        )
+        # Everything but the letters and the separators of a batch.
+        self._batch_letters = re.compile(
+            f"[^{re.escape(self.alpha + cipher_machine._BATCH_SEPARATOR)}]+"
+        )
+
+        self._byte_tables = {}
+        letters = self.alpha.encode("ascii", "ignore")
+        self._non_letters = bytes(set(range(256)) - set(letters))
+        self._non_letter_runs = (
+            re.compile(b"([^" + re.escape(letters) + b"]+)")
+            if letters
+            else None
+        )
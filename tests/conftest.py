@@ -0,0 +1,14 @@
+import pytest
+
+
+@pytest.fixture
+def lighthouse_pt():
+    # English plaintext long enough for the solvers to recover a key from.
+    return (
+        "The old lighthouse keeper climbed the winding stairs every evening "
+        "to light the great lamp. From the top he could see the fishing "
+        "boats returning to the harbour, their sails bright against the "
+        "darkening sky. He had kept the light burning for forty years, "
+        "through storms and calm weather, and never once had he let it go "
+        "out."
+    )
@@ -0,0 +1,67 @@
+import pytest
+
+from enpypher.solve import fitness
+
+
+@pytest.mark.parametrize(
+    "text, exp_indices",
+    [
+        ("", []),
+        ("abc", [0, 1, 2]),
+        ("A b-Z!", [0, 1, 25]),
+        ("Ünïcödé", [13, 2, 3]),
+    ],
+)
+def test_indices(text, exp_indices):
+    assert fitness.indices(text) == exp_indices
+
+
+@pytest.mark.parametrize(
+    "letters, n, exp_codes",
+    [
+        ([0, 1, 2], 2, [1, 28]),
+        ([25, 25, 25, 25], 4, [26**4 - 1]),
+        ([0, 1, 2], 4, []),
+    ],
+)
+def test_codes(letters, n, exp_codes):
+    assert fitness.codes(letters, n) == exp_codes
+
+
+@pytest.mark.parametrize("n", [2, 4])
+def test_ngram_table(n):
+    table = fitness.ngram_table(n)
+    assert len(table) == 26**n
+    assert fitness.ngram_table(n) is table
+    assert max(table) < 0
+
+
+def test_ngram_table_missing():
+    with pytest.raises(ValueError):
+        fitness.ngram_table(3)
+
+
+@pytest.mark.parametrize("n", [2, 4])
+def test_score(n):
+    english = fitness.indices("the rain in spain falls mainly on the plain")
+    shuffled = fitness.indices("hte nari ni psina aflls nmaily no hte lpain")
+    assert fitness.score(english, n) > fitness.score(shuffled, n)
+
+
+def test_letter_frequencies():
+    assert sum(fitness.letter_frequencies()) == pytest.approx(1)
+    assert fitness.letter_frequencies("AE") == pytest.approx(
+        [8.167 / 20.869, 12.702 / 20.869]
+    )
+
+
+@pytest.mark.parametrize(
+    "counts, expected, exp_scores",
+    [
+        ([2, 0], [0.5, 0.5], [2.0, 2.0]),
+        ([3, 1], [0.75, 0.25], [0.0, 16 / 3]),
+        ([0, 0, 0], [0.2, 0.3, 0.5], [0.0, 0.0, 0.0]),
+    ],
+)
+def test_chi_squares(counts, expected, exp_scores):
+    assert fitness.chi_squares(counts, expected) == pytest.approx(exp_scores)
@@ -0,0 +1,19 @@
+import pytest
+
+from enpypher.monoalphabetic import Monoalphabetic
+from enpypher.solve import monoalphabetic
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "QWERTYUIOPASDFGHJKLZXCVBNM",
+        "zebras",
+        "",
+    ],
+)
+def test_crack(key, lighthouse_pt):
+    ct = Monoalphabetic(key).encipher(lighthouse_pt)
+    ma = monoalphabetic.crack(ct, seed=0)
+    assert isinstance(ma, Monoalphabetic)
+    assert ma.decipher(ct) == Monoalphabetic(key).decipher(ct)
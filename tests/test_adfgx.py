@@ -191,3 +191,9 @@ def test_key(init, exp_key):
 def test_alphabet(init, exp_alpha):
     a = ADFGX(**init)
     assert a.alphabet() == exp_alpha
+
+
+def test_quiet(capsys):
+    a = ADFGX("key", "secret")
+    a.decipher(a.encipher("the quick brown fox"))
+    assert capsys.readouterr().out == ""
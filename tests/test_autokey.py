@@ -1,5 +1,8 @@
 import pytest
 
+import enpypher.cipher_machine as cipher_machine
+import enpypher.vigenere as vigenere
+
 from enpypher.autokey import Autokey
 
 
@@ -131,3 +134,140 @@ def test_encipher(init, pt, ct):
 def test_decipher(init, ct, pt):
     a = Autokey(*init)
     assert a.decipher(ct) == pt
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 1),
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 4),
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test_stream_encipher(init, pt, size):
+    a = Autokey(*init)
+    chunks = [pt[i : i + size] for i in range(0, len(pt), size)]
+    assert "".join(a.stream_encipher(chunks)) == a.encipher(pt)
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 1),
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 4),
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test_stream_decipher(init, pt, size):
+    a = Autokey(*init)
+    ct = a.encipher(pt)
+    chunks = [ct[i : i + size] for i in range(0, len(ct), size)]
+    assert "".join(a.stream_decipher(chunks)) == a.decipher(ct)
+
+
+@pytest.mark.parametrize(
+    "init, pt",
+    [
+        (["queen"], "attack at dawn attack at dusk"),
+        (["key"], "the quick brown fox jumps over 3 lazy dogs. " * 20),
+        (["KEY"], "1234567890"),
+    ],
+)
+def test_bytes(init, pt):
+    a = Autokey(*init)
+    ct = a.encipher(pt)
+    assert a.encipher(pt.encode("ascii")) == ct.encode("ascii")
+    assert a.decipher(bytearray(ct.encode("ascii"))) == bytearray(
+        a.decipher(ct).encode("ascii")
+    )
+
+
+@pytest.mark.parametrize(
+    "init, pt, block_size",
+    [
+        (["queen"], "attack at dawn\nattack at dusk\n" * 50, 16),
+        (["key"], "Ünïcödé split across blocks: ÀÉÎÕÜ.\n" * 10, 5),
+        (["ΒΓ", "ΑΒΓΔ"], "the quick brown fox jumps over 3 lazy dogs.\n", 16),
+    ],
+)
+def test_file(tmp_path, monkeypatch, init, pt, block_size):
+    monkeypatch.setattr(cipher_machine, "_FILE_BLOCK_SIZE", block_size)
+    a = Autokey(*init)
+    src, ct_path, pt_path = (tmp_path / name for name in ("src", "ct", "pt"))
+    src.write_text(pt, encoding="utf-8")
+
+    a.encipher_file(src, ct_path)
+    ct = ct_path.read_text(encoding="utf-8")
+    assert ct == a.encipher(pt)
+
+    a.decipher_file(ct_path, pt_path)
+    assert pt_path.read_text(encoding="utf-8") == a.decipher(ct)
+
+
+@pytest.mark.parametrize(
+    "init, texts",
+    [
+        (["key"], ["the quick brown fox", "jumps over 3", "", "lazy dogs."]),
+        (["queen"], ["attack at dawn", "attack at dusk"]),
+    ],
+)
+def test_many(init, texts):
+    a = Autokey(*init)
+    cts = a.encipher_many(texts)
+    assert cts == [a.encipher(text) for text in texts]
+    assert a.decipher_many(cts) == [a.decipher(ct) for ct in cts]
+
+
+@pytest.mark.parametrize(
+    "init, pt",
+    [
+        (["key"], "the quick brown fox jumps over 3 lazy dogs."),
+        (["queen"], "Ünïcödé 𝄞 and $12 " * 300),
+        (["key"], ""),
+    ],
+)
+def test_numpy_engine(init, pt):
+    pytest.importorskip("numpy")
+    a = Autokey(*init)
+    ct, dec = a.encipher(pt), a.decipher(a.encipher(pt))
+    a.set_engine("numpy")
+    assert a.encipher(pt) == ct
+    assert a.decipher(ct) == dec
+    assert "".join(a.stream_encipher([pt[:5], pt[5:]])) == ct
+
+
+@pytest.mark.parametrize(
+    "init, pt",
+    [
+        (["key"], "the quick brown fox jumps over 3 lazy dogs. " * 20),
+        (["queen"], "thequickbrownfoxjumpsoverthelazydog" * 20),
+        (["ΒΓ", "ΑΒΓΔ"], "ΑΒΓΔ ab ΔΔ𝄞 " * 20),
+        (["key"], "ab"),
+    ],
+)
+def test_decipher_lanes(monkeypatch, init, pt):
+    a = Autokey(*init)
+    ct = a.encipher(pt)
+    chunks = [ct[i : i + 100] for i in range(0, len(ct), 100)]
+    monkeypatch.setattr(vigenere, "_STRIDED_MIN_LENGTH", len(ct) + 1)
+    dec = a.decipher(ct)
+    monkeypatch.setattr(vigenere, "_STRIDED_MIN_LENGTH", 0)
+    assert a.decipher(ct) == dec
+    assert "".join(a.stream_decipher(chunks)) == dec
+
+
+@pytest.mark.parametrize("key", ["lemon", "k", "cryptography", "abcab"])
+def test_crack(key, lighthouse_pt):
+    ct = Autokey(key).encipher(lighthouse_pt)
+    ranked, a = Autokey.crack(ct)
+    assert ranked[0][0] == a.key() == key.upper()
+    assert a.decipher(ct) == Autokey(key).decipher(ct)
+    assert [score for _, score in ranked] == sorted(
+        (score for _, score in ranked), reverse=True
+    )
+
+
+def test_crack_workers(lighthouse_pt):
+    ct = Autokey("queenly").encipher(lighthouse_pt)
+    ranked, a = Autokey.crack(ct, max_length=8, workers=2)
+    assert a.key() == "QUEENLY"
@@ -1,6 +1,8 @@
 import pytest
 
-from enpypher.cipher_machine import CipherMachine
+from enpypher.cipher_machine import CipherMachine, _cleaning_plan
+from enpypher.columnar import Columnar
+from enpypher.shift import Shift
 
 
 @pytest.mark.parametrize(
@@ -146,6 +148,163 @@ def test__clean_input(
     )
 
 
+@pytest.mark.parametrize(
+    "text, exp_text, other, conv_other",
+    [
+        ("a$€b", "AB", False, False),
+        ("a!?b", "AB", True, False),
+        ("a$€b", "ADOLLARSIGNEUROSIGNB", True, True),
+        ("ss$$ss", "SSSS", False, False),
+    ],
+)
+def test__clean_input_adjacent(text, exp_text, other, conv_other):
+    assert (
+        CipherMachine._clean_input(
+            text, False, False, False, False, False, False, other, conv_other
+        )
+        == exp_text
+    )
+
+
+@pytest.mark.parametrize(
+    "text, exp_text, other, conv_other",
+    [
+        ("a𝄞b", "AB", False, False),
+        ("a𝐀b", "A𝐀B", False, False),
+        ("a𝄞b", "A𝄞B", True, False),
+        ("a𝄞b", "AMUSICALSYMBOLGCLEFB", True, True),
+    ],
+)
+def test__clean_input_astral(text, exp_text, other, conv_other):
+    assert (
+        CipherMachine._clean_input(
+            text, False, False, False, False, False, False, other, conv_other
+        )
+        == exp_text
+    )
+
+
+def test__clean_input_punctuation_heavy():
+    text = "a.b,c;d!(e)-f?" * 200000
+    assert CipherMachine._clean_input(text) == "ABCDEF" * 200000
+
+
+@pytest.mark.parametrize(
+    "text, exp_text",
+    [
+        (
+            "In 1990 I paid $1,234.50 for 3 cats.",
+            "IN NINETEEN NINETY I PAID USD ONE THOUSAND, TWO HUNDRED AND "
+            "THIRTY-FOUR POINT FIVE FOR THREE CATS.",
+        ),
+        ("12 € each, 7,", "TWELVE € EACH, SEVEN"),
+        ("3.5 and 4", "THREE POINT FIVE AND FOUR"),
+    ],
+)
+def test__clean_input_conv_num(text, exp_text):
+    flags = (True, True, False, True, True, False, True, False)
+    assert CipherMachine._clean_input(text, *flags) == exp_text
+
+
+def test__clean_input_numeric_heavy():
+    flags = (True, True, False, True, True, False, True, False)
+    text = "Item 17, 45 at $3.50 "
+    exp_text = CipherMachine._clean_input(text, *flags)
+    assert CipherMachine._clean_input(text * 20000, *flags) == exp_text * 20000
+
+
+def test__cleaning_plan_cached():
+    flags = (True, True, False, True, False, False, True, False, "")
+    assert _cleaning_plan(*flags) is _cleaning_plan(*flags)
+    assert _cleaning_plan(*flags) is not _cleaning_plan(*flags[:-1], "AB")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "In 1990 I paid $1,234.50 for 3 cats, 5$ each.",
+        "the year was 2001 and by 1999 it had rained 12,000 times",
+        "no numbers here at all",
+        "1234567890",
+    ],
+)
+def test__stream_clean(text):
+    flags = (True, True, False, True, True, False, True, False)
+    exp_text = CipherMachine._clean_input(text, *flags)
+    for size in range(1, len(text) + 1):
+        chunks = [text[i : i + size] for i in range(0, len(text), size)]
+        assert "".join(Shift(0)._stream_clean(chunks, *flags)) == exp_text
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 1),
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test__stream(init, pt, size):
+    # Transpositions gather the chunks and cipher them in one go.
+    c = Columnar(*init)
+    chunks = [pt[i : i + size] for i in range(0, len(pt), size)]
+    ct = "".join(c.stream_encipher(chunks))
+    assert ct == c.encipher(pt)
+    chunks = [ct[i : i + size] for i in range(0, len(ct), size)]
+    assert "".join(c.stream_decipher(chunks)) == c.decipher(ct)
+
+
+@pytest.mark.parametrize(
+    "text, exp_ic",
+    [
+        ("", 0.0),
+        ("a", 0.0),
+        ("aa", 26.0),
+        ("ab", 0.0),
+        ("a a b b!", 26 * 4 / 12),
+    ],
+)
+def test_findIC(text, exp_ic):
+    assert Shift(0).findIC(text) == pytest.approx(exp_ic)
+
+
+def test_findIC_alphabet():
+    s = Shift(0, "ABC")
+    assert s.findIC("aabbcc") == pytest.approx(3 * 6 / 30)
+
+
+def test_stats():
+    stats = Shift(0).stats("The quick brown fox jumps over the lazy dog.")
+    assert stats.histogram["O"] == 4
+    assert stats.histogram["Z"] == 1
+    assert sum(stats.histogram.values()) == 35
+    assert list(stats.histogram) == list(Shift(0).alphabet())
+    assert stats.window_ic == []
+
+
+@pytest.mark.parametrize("window", [2, 5, 13, 35, 36])
+def test_stats_window_ic(window):
+    s = Shift(0)
+    text = "thequickbrownfoxjumpsoverthelazydog"
+    exp = [
+        s.findIC(text[i : i + window]) for i in range(len(text) - window + 1)
+    ]
+    assert s.stats(text, window).window_ic == pytest.approx(exp)
+
+
+def test_stats_window_too_small():
+    with pytest.raises(ValueError):
+        Shift(0).stats("abc", 1)
+
+
+def test_set_engine():
+    with pytest.raises(ValueError):
+        Columnar("key").set_engine("numpy")
+    with pytest.raises(ValueError):
+        Shift(0).set_engine("fortran")
+    with pytest.raises(ValueError):
+        Shift(0).set_engine("numpy")
+
+
 @pytest.mark.parametrize(
     "key, size, exp_grid",
     [
@@ -191,3 +191,56 @@ def test_key(init, exp_key):
 def test_alphabet(init, exp_alpha):
     c = Columnar(*init)
     assert c.alphabet() == exp_alpha
+
+
+@pytest.mark.parametrize("key", ["secret", "k", "thequickbrownfox"])
+@pytest.mark.parametrize(
+    "pt",
+    [
+        "the quick brown fox jumps over 3 lazy dogs. " * 50,
+        "Η γρήγορη καφετιά αλεπού πηδά πάνω από το τεμπέλικο σκυλί. " * 50,
+    ],
+)
+def test_long(capsys, key, pt):
+    c = Columnar(key)
+    cleaned = Columnar("a").encipher(pt)
+    ct = c.encipher(pt)
+    assert sorted(ct) == sorted(cleaned)
+    assert c.decipher(ct) == cleaned.lower()
+    assert capsys.readouterr().out == ""
+
+
+def test_empty_key():
+    with pytest.raises(ValueError):
+        Columnar("123").encipher("plaintext")
+
+
+@pytest.mark.parametrize("key", ["secret", "zebras", "columnar", "cryptogram"])
+def test_crack(key, lighthouse_pt):
+    ct = Columnar(key).encipher(lighthouse_pt)
+    ranked, c = Columnar.crack(ct, max_width=10, seed=0)
+    assert ranked[0][0] == c.key()
+    assert c.decipher(ct) == Columnar(key).decipher(ct)
+    assert [score for _, score in ranked] == sorted(
+        (score for _, score in ranked), reverse=True
+    )
+
+
+def test_crack_workers(lighthouse_pt):
+    ct = Columnar("secret").encipher(lighthouse_pt)
+    ranked, c = Columnar.crack(ct, max_width=7, seed=0, workers=2)
+    assert c.decipher(ct) == Columnar("secret").decipher(ct)
+
+
+@pytest.mark.parametrize("key", ["zebras", "gunpowder"])
+def test_crack_exhaustive(key, lighthouse_pt):
+    ct = Columnar(key).encipher(lighthouse_pt)
+    ranked, c = Columnar.crack(ct, max_width=9, exhaustive=True)
+    assert c.decipher(ct) == Columnar(key).decipher(ct)
+    assert len(ranked) == 8
+
+
+def test_crack_exhaustive_workers(lighthouse_pt):
+    ct = Columnar("secret").encipher(lighthouse_pt)
+    _, c = Columnar.crack(ct, max_width=7, workers=2, exhaustive=True)
+    assert c.decipher(ct) == Columnar("secret").decipher(ct)
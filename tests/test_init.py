@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+import pytest
+
+import enpypher
+
+# Generous enough for a slow machine, but far below what num2words alone
+# costs to import.
+_IMPORT_BUDGET_US = 150_000
+
+_LAZY_MODULES = ("num2words", "bidict", "concurrent.futures")
+
+
+def _import_time(statement):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Only the outermost imports, which include everything imported under them.
+    total = 0
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].startswith(" enpypher"):
+            total += int(fields[1])
+    return total, result.stdout
+
+
+@pytest.mark.parametrize("name", enpypher.__all__)
+def test_getattr(name):
+    machine = getattr(enpypher, name)
+    assert machine.__name__ == name
+    assert name in dir(enpypher)
+
+
+def test_getattr_missing():
+    with pytest.raises(AttributeError):
+        enpypher.Enigma
+
+
+def test_import_time():
+    statement = (
+        "import sys, enpypher; "
+        + "; ".join(f"enpypher.{name}" for name in enpypher.__all__)
+        + f"; print(*(m in sys.modules for m in {_LAZY_MODULES!r}))"
+    )
+    total, stdout = _import_time(statement)
+    assert stdout.split() == ["False"] * len(_LAZY_MODULES)
+    assert 0 < total < _IMPORT_BUDGET_US
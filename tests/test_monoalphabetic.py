@@ -1,5 +1,7 @@
 import pytest
 
+import enpypher.cipher_machine as cipher_machine
+
 from enpypher.monoalphabetic import Monoalphabetic
 
 
@@ -182,3 +184,109 @@ def test_key(init, exp_key):
 def test_alphabet(init, exp_alpha):
     ma = Monoalphabetic(*init)
     assert ma.alphabet() == exp_alpha
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 1),
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 4),
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test_stream_encipher(init, pt, size):
+    ma = Monoalphabetic(*init)
+    chunks = [pt[i : i + size] for i in range(0, len(pt), size)]
+    assert "".join(ma.stream_encipher(chunks)) == ma.encipher(pt)
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 1),
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 4),
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test_stream_decipher(init, pt, size):
+    ma = Monoalphabetic(*init)
+    ct = ma.encipher(pt)
+    chunks = [ct[i : i + size] for i in range(0, len(ct), size)]
+    assert "".join(ma.stream_decipher(chunks)) == ma.decipher(ct)
+
+
+@pytest.mark.parametrize(
+    "init, pt, block_size",
+    [
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.\n", 1 << 20),
+        (["zebras"], "the quick brown fox jumps over 3 lazy dogs.\n" * 50, 16),
+        (["secret"], "Ünïcödé split across blocks: ÀÉÎÕÜ.\n" * 10, 5),
+        (["zebras"], "", 16),
+        (["Δ", "ABCΔ"], "a cab, a bad dab.\n" * 20, 16),
+        (
+            ["ΜΥΣΤΙΚΟ", "ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ"],
+            "the quick brown fox jumps over 3 lazy dogs.\n",
+            16,
+        ),
+    ],
+)
+def test_file(tmp_path, monkeypatch, init, pt, block_size):
+    monkeypatch.setattr(cipher_machine, "_FILE_BLOCK_SIZE", block_size)
+    ma = Monoalphabetic(*init)
+    src, ct_path, pt_path = (tmp_path / name for name in ("src", "ct", "pt"))
+    src.write_text(pt, encoding="utf-8")
+
+    ma.encipher_file(src, ct_path)
+    ct = ct_path.read_text(encoding="utf-8")
+    assert ct == ma.encipher(pt)
+
+    ma.decipher_file(ct_path, pt_path)
+    assert pt_path.read_text(encoding="utf-8") == ma.decipher(ct)
+
+
+@pytest.mark.parametrize(
+    "init, pt, bytes_type",
+    [
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", bytes),
+        (["zebras"], "the quick brown fox jumps over 3 lazy dogs.", bytearray),
+        (
+            ["secret"],
+            "the quick brown fox jumps over 3 lazy dogs.",
+            memoryview,
+        ),
+        (["zebras"], "a+b=c <tab>\there $5 ~~~", bytes),
+        (["secret"], "", bytes),
+    ],
+)
+def test_bytes(init, pt, bytes_type):
+    ma = Monoalphabetic(*init)
+    ct = ma.encipher(bytes_type(pt.encode("ascii")))
+    assert type(ct) is bytes_type
+    assert bytes(ct) == ma.encipher(pt).encode("ascii")
+
+    dec = ma.decipher(ct)
+    assert type(dec) is bytes_type
+    assert bytes(dec) == ma.decipher(ma.encipher(pt)).encode("ascii")
+
+
+@pytest.mark.parametrize(
+    "init, texts, workers",
+    [
+        (
+            ["secret"],
+            ["the quick brown fox", "jumps over 3", "", "lazy dogs."],
+            None,
+        ),
+        (
+            ["zebras"],
+            ["the quick brown fox", "jumps over 3", "", "lazy dogs."],
+            2,
+        ),
+        (["secret"], ["null \x00 separated", "text"], None),
+    ],
+)
+def test_many(init, texts, workers):
+    ma = Monoalphabetic(*init)
+    cts = ma.encipher_many(texts, workers)
+    assert cts == [ma.encipher(text) for text in texts]
+    assert ma.decipher_many(cts, workers) == [ma.decipher(ct) for ct in cts]
@@ -0,0 +1,171 @@
+import shutil
+
+import pytest
+
+import enpypher.cipher_machine as cipher_machine
+
+from enpypher.otp import OTP
+
+
+@pytest.mark.parametrize(
+    "init, pt, exp_pt",
+    [
+        (
+            [],
+            "thequickbrownfoxjumpsoverthelazydog",
+            "thequickbrownfoxjumpsoverthelazydog",
+        ),
+        (
+            [],
+            "the quick brown fox jumps over 3 lazy dogs.",
+            "the quick brown fox jumps over 3 lazy dogs.",
+        ),
+        (
+            [],
+            "1234567890",
+            "1234567890",
+        ),
+        (
+            ["ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ"],
+            "Η γρήγορη καφετιά αλεπού πηδά πάνω από το τεμπέλικο σκυλί.",
+            "η γρηγορη καφετια αλεπου πηδα πανω απο το τεμπελικο σκυλι.",
+        ),
+    ],
+)
+def test_encipher(init, pt, exp_pt):
+    o = OTP(*init)
+    ct = o.encipher(pt)
+    assert len(o.key()) == sum(1 for char in ct if char in o.alphabet())
+    assert o.decipher(ct) == exp_pt
+
+
+@pytest.mark.parametrize(
+    "pt, size",
+    [
+        ("the quick brown fox jumps over 3 lazy dogs.", 1),
+        ("the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test_stream_encipher(pt, size):
+    o = OTP()
+    chunks = [pt[i : i + size] for i in range(0, len(pt), size)]
+    ct = "".join(o.stream_encipher(chunks))
+    assert o.decipher(ct) == pt
+
+
+@pytest.mark.parametrize(
+    "pt, bytes_type",
+    [
+        (b"the quick brown fox jumps over 3 lazy dogs.", bytes),
+        (b"the quick brown fox jumps over 3 lazy dogs.", bytearray),
+        (b"the quick brown fox jumps over 3 lazy dogs.", memoryview),
+    ],
+)
+def test_bytes(pt, bytes_type):
+    o = OTP()
+    ct = o.encipher(bytes_type(pt))
+    assert type(ct) is bytes_type
+    assert len(o.key()) == sum(1 for char in bytes(ct) if chr(char).isalpha())
+    assert bytes(o.decipher(ct)) == pt
+
+
+@pytest.mark.parametrize(
+    "init, pt, exp_pt",
+    [
+        (
+            [],
+            "the quick brown fox jumps over 3 lazy dogs.\n" * 10,
+            "the quick brown fox jumps over 3 lazy dogs.\n" * 10,
+        ),
+        (
+            ["ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ"],
+            "the quick brown fox, 3 dogs.\n",
+            "the quick brown fox, 3 dogs.\n",
+        ),
+        (
+            [],
+            "ünïcödé split across blocks: àéîõü.\n" * 10,
+            "unicode split across blocks: aeiou.\n" * 10,
+        ),
+    ],
+)
+def test_file(tmp_path, monkeypatch, init, pt, exp_pt):
+    monkeypatch.setattr(cipher_machine, "_FILE_BLOCK_SIZE", 16)
+    o = OTP(*init)
+    src, ct_path, pt_path = (tmp_path / name for name in ("src", "ct", "pt"))
+    src.write_text(pt, encoding="utf-8")
+
+    o.encipher_file(src, ct_path)
+    o.decipher_file(ct_path, pt_path)
+    assert pt_path.read_text(encoding="utf-8") == exp_pt
+
+
+def test_many():
+    o = OTP()
+    with pytest.raises(TypeError):
+        o.encipher_many(["the quick brown fox", "jumps over 3 lazy dogs."])
+    ct = o.encipher("the quick brown fox")
+    assert o.decipher_many([ct]) == ["the quick brown fox"]
+
+
+@pytest.mark.parametrize(
+    "alpha", ["ABCDEFGHIJKLMNOPQRSTUVWXYZ", "ABC", "ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ"]
+)
+def test_random_pad(alpha):
+    o = OTP(alpha)
+    pad = o._random_pad(10000)
+    assert len(pad) == 10000
+    assert set(pad) == set(range(len(o.alphabet())))
+
+
+def test_pad_file(tmp_path):
+    path = tmp_path / "pad"
+    OTP().write_pad(path, 60)
+    assert path.stat().st_size == 60
+
+    # The receiver has their own copy of the pad.
+    shutil.copyfile(path, tmp_path / "copy")
+    sender, receiver = OTP(pad_file=path), OTP(pad_file=tmp_path / "copy")
+    pts = ["the quick brown fox", "jumps over 3 lazy dogs."]
+    cts = [sender.encipher(pt) for pt in pts]
+    assert [receiver.decipher(ct) for ct in cts] == pts
+    assert receiver.pad_offset == sender.pad_offset > 0
+    assert receiver.key() == ""
+
+    offset = sender.pad_offset
+    with pytest.raises(ValueError):
+        sender.encipher("the pad runs out before the end of this message")
+    assert sender.pad_offset == offset
+    assert receiver.decipher(sender.encipher("lazy dogs")) == "lazy dogs"
+
+
+def test_pad_file_stream(tmp_path):
+    path = tmp_path / "pad"
+    pt = "the quick brown fox jumps over 3 lazy dogs."
+    OTP().write_pad(path, 35)
+    shutil.copyfile(path, tmp_path / "copy")
+    chunks = [pt[i : i + 5] for i in range(0, len(pt), 5)]
+    ct = "".join(OTP(pad_file=path).stream_encipher(chunks))
+    assert OTP(pad_file=tmp_path / "copy").decipher(ct) == pt
+
+
+def test_pad_file_offset_saved(tmp_path):
+    path, copy = tmp_path / "pad", tmp_path / "copy"
+    pt = "the quick brown fox"
+    OTP().write_pad(path, 60)
+    shutil.copyfile(path, copy)
+
+    senders = [OTP(pad_file=path), OTP(pad_file=path)]
+    cts = [sender.encipher(pt) for sender in senders]
+    assert OTP(pad_file=path).pad_offset == 32
+    o = OTP(pad_file=path, pad_offset=0)
+    o.encipher("abc")
+    assert o.pad_offset == 35
+
+    receiver = OTP(pad_file=copy)
+    assert [receiver.decipher(ct) for ct in cts] == [pt, pt]
+    assert OTP(pad_file=copy, pad_offset=0).decipher(cts[0]) == pt
+    assert OTP(pad_file=copy).pad_offset == 32
+
+    OTP().write_pad(path, 60)
+    assert OTP(pad_file=path).pad_offset == 0
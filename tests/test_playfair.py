@@ -181,3 +181,105 @@ def test_key(init, exp_key):
 def test_alphabet(init, exp_alpha):
     p = Playfair(*init)
     assert p.alphabet() == exp_alpha
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        (["secret"], "mybiggestjigsawpuzzleisapictureofstarrynight", 1),
+        (["secret"], "mybiggestjigsawpuzzleisapictureofstarrynight", 4),
+        (["secret"], "mybiggestjigsawpuzzleisapictureofstarrynight", 7),
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 1),
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 4),
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test_stream_encipher(init, pt, size):
+    p = Playfair(*init)
+    chunks = [pt[i : i + size] for i in range(0, len(pt), size)]
+    assert "".join(p.stream_encipher(chunks)) == p.encipher(pt)
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        (["secret"], "mybiggestjigsawpuzzleisapictureofstarrynight", 1),
+        (["secret"], "mybiggestjigsawpuzzleisapictureofstarrynight", 4),
+        (["secret"], "mybiggestjigsawpuzzleisapictureofstarrynight", 7),
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 1),
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 4),
+        (["secret"], "the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test_stream_decipher(init, pt, size):
+    p = Playfair(*init)
+    ct = p.encipher(pt)
+    chunks = [ct[i : i + size] for i in range(0, len(ct), size)]
+    assert "".join(p.stream_decipher(chunks)) == p.decipher(ct)
+
+
+def test_odd_letters():
+    with pytest.raises(ValueError):
+        Playfair("key").decipher("ABC")
+
+
+@pytest.mark.parametrize("key", ["key", "secret"])
+def test_long(key):
+    pt = (
+        "the balloon was full of helium, see, and all three of us floated. "
+        * 50
+    )
+    p = Playfair(key)
+    ct = p.encipher(pt)
+    assert ct == "".join(
+        p.stream_encipher(pt[i : i + 7] for i in range(0, len(pt), 7))
+    )
+    # Fillers are put between doubled letters and at the end.
+    assert p.decipher(ct).replace("x", "") == pt
+
+
+CRACK_PT = (
+    "The market opened early on the first warm morning of spring, and the "
+    "square filled with farmers unloading crates of onions, radishes and "
+    "young lettuce. A baker sold bread still hot from the oven while children "
+    "chased pigeons between the stalls. By noon the fishmonger had nothing "
+    "left but ice, and the old woman who mended umbrellas was telling anyone "
+    "who would listen that it would rain before supper. Nobody believed her, "
+    "yet everybody bought an umbrella anyway, just in case the weather turned."
+)
+
+
+def test_crack():
+    ct = Playfair("market square").encipher(CRACK_PT)
+    ranked, p = Playfair.crack(ct, chains=1, steps=12000, seed=13)
+    assert p.decipher(ct) == Playfair("market square").decipher(ct)
+    # Squares are rotated to put A in the top left corner.
+    assert ranked[0][0] == p.key() == "ARKEMSQUBTDFGHCLNOPIWXYZV"
+
+
+def test_crack_workers():
+    ct = Playfair("market square").encipher(CRACK_PT)
+    ranked, p = Playfair.crack(ct, chains=2, steps=12000, seed=12, workers=2)
+    assert p.decipher(ct) == Playfair("market square").decipher(ct)
+    assert [score for _, score in ranked] == sorted(
+        (score for _, score in ranked), reverse=True
+    )
+
+
+def test_crack_short():
+    with pytest.raises(ValueError):
+        Playfair.crack("AB")
+
+
+@pytest.mark.parametrize("steps", [0, -1])
+def test_crack_no_steps(steps):
+    ct = Playfair("market square").encipher(CRACK_PT)
+    with pytest.raises(ValueError, match="step"):
+        Playfair.crack(ct, steps=steps)
+
+
+def test_crack_one_step():
+    ct = Playfair("market square").encipher(CRACK_PT)
+    ranked, p = Playfair.crack(ct, chains=1, steps=1, seed=1)
+    assert sorted(p.key()) == sorted(ranked[0][0])
+    assert len(p.key()) == 25
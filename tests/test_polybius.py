@@ -2,6 +2,8 @@ import string
 
 import pytest
 
+import enpypher.cipher_machine as cipher_machine
+
 from enpypher.polybius import Polybius
 
 
@@ -197,3 +199,169 @@ def test_key(init, exp_key):
 def test_alphabet(init, exp_alpha):
     pb = Polybius(**init)
     assert pb.alphabet() == exp_alpha
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        ({"key": "key"}, "the quick brown fox jumps over 3 lazy dogs.", 1),
+        ({"key": "key"}, "the quick brown fox jumps over 3 lazy dogs.", 4),
+        ({"key": "key"}, "the quick brown fox jumps over 3 lazy dogs.", 7),
+        ({"key": "key"}, "In 1990 I paid $1,234.50 for 3 cats.", 1),
+        ({"key": "key"}, "In 1990 I paid $1,234.50 for 3 cats.", 4),
+        ({"key": "key"}, "In 1990 I paid $1,234.50 for 3 cats.", 7),
+    ],
+)
+def test_stream_encipher(init, pt, size):
+    pb = Polybius(**init)
+    chunks = [pt[i : i + size] for i in range(0, len(pt), size)]
+    assert "".join(pb.stream_encipher(chunks)) == pb.encipher(pt)
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        ({"key": "key"}, "the quick brown fox jumps over 3 lazy dogs.", 1),
+        ({"key": "key"}, "the quick brown fox jumps over 3 lazy dogs.", 4),
+        ({"key": "key"}, "the quick brown fox jumps over 3 lazy dogs.", 7),
+        ({"key": "key"}, "In 1990 I paid $1,234.50 for 3 cats.", 1),
+        ({"key": "key"}, "In 1990 I paid $1,234.50 for 3 cats.", 4),
+        ({"key": "key"}, "In 1990 I paid $1,234.50 for 3 cats.", 7),
+    ],
+)
+def test_stream_decipher(init, pt, size):
+    pb = Polybius(**init)
+    ct = pb.encipher(pt)
+    chunks = [ct[i : i + size] for i in range(0, len(ct), size)]
+    assert "".join(pb.stream_decipher(chunks)) == pb.decipher(ct)
+
+
+@pytest.mark.parametrize(
+    "init, pt",
+    [
+        ({"key": "key"}, "In\n1990\nI\npaid\n$1,234.50\nfor\n3\ncats.\n" * 5),
+        ({"key": "key"}, "one\ttwo\r\nthree\n4\n" * 5),
+    ],
+)
+def test_stream_newlines(init, pt):
+    pb = Polybius(**init)
+    read = []
+
+    def chunks():
+        for i in range(0, len(pt), 4):
+            read.append(i)
+            yield pt[i : i + 4]
+
+    stream = pb.stream_encipher(chunks())
+    first = next(stream)
+    # Words split by whitespace other than spaces are still let through
+    # before the end of the text.
+    assert len(read) < len(range(0, len(pt), 4))
+    assert first + "".join(stream) == pb.encipher(pt)
+
+
+@pytest.mark.parametrize(
+    "init, pt, block_size",
+    [
+        (
+            {"key": "key"},
+            "the quick brown fox jumps over 3 lazy dogs.\n",
+            1 << 20,
+        ),
+        (
+            {"key": "zebras"},
+            "the quick brown fox jumps over 3 lazy dogs.\n" * 50,
+            16,
+        ),
+        ({"key": "key"}, "Ünïcödé split across blocks: ÀÉÎÕÜ.\n" * 10, 5),
+        ({"key": "zebras"}, "", 16),
+    ],
+)
+def test_file(tmp_path, monkeypatch, init, pt, block_size):
+    monkeypatch.setattr(cipher_machine, "_FILE_BLOCK_SIZE", block_size)
+    pb = Polybius(**init)
+    src, ct_path, pt_path = (tmp_path / name for name in ("src", "ct", "pt"))
+    src.write_text(pt, encoding="utf-8")
+
+    pb.encipher_file(src, ct_path)
+    ct = ct_path.read_text(encoding="utf-8")
+    assert ct == pb.encipher(pt)
+
+    pb.decipher_file(ct_path, pt_path)
+    assert pt_path.read_text(encoding="utf-8") == pb.decipher(ct)
+
+
+@pytest.mark.parametrize(
+    "init, texts, workers",
+    [
+        (
+            {"key": "key"},
+            ["the quick brown fox", "jumps over 3", "", "lazy dogs."],
+            None,
+        ),
+        (
+            {"key": "zebras"},
+            ["the quick brown fox", "jumps over 3", "", "lazy dogs."],
+            2,
+        ),
+        ({"key": "key"}, ["null \x00 separated", "text"], None),
+    ],
+)
+def test_many(init, texts, workers):
+    pb = Polybius(**init)
+    cts = pb.encipher_many(texts, workers)
+    assert cts == [pb.encipher(text) for text in texts]
+    assert pb.decipher_many(cts, workers) == [pb.decipher(ct) for ct in cts]
+
+
+@pytest.mark.parametrize(
+    "init, texts",
+    [
+        (
+            {"key": "key", "alpha": string.ascii_uppercase + string.digits},
+            ["In 1990 I paid", "$1,234.50 for 3 cats."],
+        ),
+    ],
+)
+def test_many_digits(init, texts):
+    pb = Polybius(**init)
+    assert pb.encipher_many(texts) == [pb.encipher(text) for text in texts]
+
+
+@pytest.mark.parametrize(
+    "init, pt",
+    [
+        ({"key": "key"}, "the quick brown fox jumps over 3 lazy dogs."),
+        ({"key": "zebras"}, "Ünïcödé 𝄞 and $12 " * 300),
+        ({"key": "key"}, ""),
+    ],
+)
+def test_numpy_engine(init, pt):
+    pytest.importorskip("numpy")
+    pb = Polybius(**init)
+    ct, dec = pb.encipher(pt), pb.decipher(pb.encipher(pt))
+    pb.set_engine("numpy")
+    assert pb.encipher(pt) == ct
+    assert pb.decipher(ct) == dec
+    assert "".join(pb.stream_encipher([pt[:5], pt[5:]])) == ct
+
+
+@pytest.mark.parametrize(
+    "init, pt, ct",
+    [
+        (
+            {
+                "key": "key",
+                "size": 10,
+                "alpha": string.ascii_uppercase + string.digits,
+            },
+            "the quick brown fox",
+            "3111012 2832211611 1529263425 182635",
+        ),
+    ],
+)
+def test_numpy_engine_wide(init, pt, ct):
+    pytest.importorskip("numpy")
+    pb = Polybius(**init)
+    pb.set_engine("numpy")
+    assert pb.encipher(pt) == ct
@@ -132,3 +132,62 @@ def test_key(init, exp_key):
 def test_alphabet(init, exp_alpha):
     r = Railfence(*init)
     assert r.alphabet() == exp_alpha
+
+
+@pytest.mark.parametrize(
+    "pt",
+    [
+        "the quick brown fox jumps over 3 lazy dogs.",
+        "Η γρήγορη καφετιά αλεπού πηδά πάνω από το τεμπέλικο σκυλί.",
+        "",
+    ],
+)
+def test_one_rail(pt):
+    r = Railfence(1)
+    assert r.encipher(pt) == pt.upper()
+    assert r.decipher(pt.upper()) == pt.lower()
+
+
+def test_no_rails():
+    with pytest.raises(ValueError):
+        Railfence(0)
+
+
+@pytest.mark.parametrize("key", [2, 3, 7, 100, 5000])
+@pytest.mark.parametrize(
+    "pt",
+    [
+        "the quick brown fox jumps over 3 lazy dogs. " * 50,
+        "Η γρήγορη καφετιά αλεπού πηδά πάνω από το τεμπέλικο σκυλί. " * 50,
+    ],
+)
+def test_long(key, pt):
+    r = Railfence(key)
+    ct = r.encipher(pt)
+    assert sorted(ct) == sorted(pt.upper())
+    assert r.decipher(ct) == pt.lower()
+
+
+@pytest.mark.parametrize("key", [2, 3, 5])
+def test_offset(key):
+    pt = "thequickbrownfoxjumpsoverthelazydog"
+    for offset in range(2 * (key - 1)):
+        r = Railfence(key, offset=offset)
+        padded = Railfence(key).encipher("#" * offset + pt)
+        assert r.encipher(pt) == padded.replace("#", "")
+        assert r.decipher(r.encipher(pt)) == pt
+
+
+@pytest.mark.parametrize("key, offset", [(2, 0), (3, 0), (7, 0), (6, 4)])
+def test_crack(key, offset, lighthouse_pt):
+    ct = Railfence(key, offset=offset).encipher(lighthouse_pt)
+    ranked = Railfence.crack(ct, offsets=bool(offset))
+    assert ranked[0][:2] == (key, offset)
+    assert [score for *_, score in ranked] == sorted(
+        (score for *_, score in ranked), reverse=True
+    )
+
+
+def test_crack_workers(lighthouse_pt):
+    ct = Railfence(5).encipher(lighthouse_pt)
+    assert Railfence.crack(ct, max_rails=8, workers=2)[0][:2] == (5, 0)
@@ -163,3 +163,73 @@ def test_key(init, exp_key):
 def test_alphabet(init, exp_alpha):
     s = Shift(*init)
     assert s.alphabet() == exp_alpha
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        ([3], "the quick brown fox jumps over 3 lazy dogs.", 1),
+        ([3], "the quick brown fox jumps over 3 lazy dogs.", 4),
+        ([3], "the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test_stream_encipher(init, pt, size):
+    s = Shift(*init)
+    chunks = [pt[i : i + size] for i in range(0, len(pt), size)]
+    assert "".join(s.stream_encipher(chunks)) == s.encipher(pt)
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        ([3], "the quick brown fox jumps over 3 lazy dogs.", 1),
+        ([3], "the quick brown fox jumps over 3 lazy dogs.", 4),
+        ([3], "the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test_stream_decipher(init, pt, size):
+    s = Shift(*init)
+    ct = s.encipher(pt)
+    chunks = [ct[i : i + size] for i in range(0, len(ct), size)]
+    assert "".join(s.stream_decipher(chunks)) == s.decipher(ct)
+
+
+@pytest.mark.parametrize(
+    "init, texts, workers",
+    [
+        ([3], ["the quick brown fox", "jumps over 3", "", "lazy dogs."], None),
+        ([13], ["the quick brown fox", "jumps over 3", "", "lazy dogs."], 2),
+        ([3], ["null \x00 separated", "text"], None),
+    ],
+)
+def test_many(init, texts, workers):
+    s = Shift(*init)
+    cts = s.encipher_many(texts, workers)
+    assert cts == [s.encipher(text) for text in texts]
+    assert s.decipher_many(cts, workers) == [s.decipher(ct) for ct in cts]
+
+
+@pytest.mark.parametrize(
+    "key, pt",
+    [
+        (3, "the quick brown fox jumps over the lazy dog"),
+        (0, "it is a truth universally acknowledged, that a single man"),
+        (25, "never once had he let the light go out in forty years"),
+        (40, "from the top he could see the fishing boats returning"),
+    ],
+)
+def test_crack(key, pt):
+    ranked = Shift.crack(Shift(key).encipher(pt))
+    assert ranked[0][0] == key % 26
+    assert sorted(shift for shift, _ in ranked) == list(range(26))
+    assert [score for _, score in ranked] == sorted(
+        score for _, score in ranked
+    )
+
+
+def test_crack_alphabet():
+    s = Shift(2, "ABCDEFGHIJKLMNOPQRSTUVWXY")
+    ct = s.encipher("the old lighthouse keeper climbed the winding stairs")
+    assert Shift.crack(ct, s.alphabet())[0][0] == 2
+    with pytest.raises(ValueError):
+        Shift.crack(ct, "ΑΒΓ")
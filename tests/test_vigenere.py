@@ -1,5 +1,8 @@
 import pytest
 
+import enpypher.cipher_machine as cipher_machine
+import enpypher.vigenere as vigenere
+
 from enpypher.vigenere import Vigenere
 
 
@@ -171,3 +174,163 @@ def test_key(init, exp_key):
 def test_alphabet(init, exp_alpha):
     v = Vigenere(*init)
     assert v.alphabet() == exp_alpha
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 1),
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 4),
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test_stream_encipher(init, pt, size):
+    v = Vigenere(*init)
+    chunks = [pt[i : i + size] for i in range(0, len(pt), size)]
+    assert "".join(v.stream_encipher(chunks)) == v.encipher(pt)
+
+
+@pytest.mark.parametrize(
+    "init, pt, size",
+    [
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 1),
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 4),
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", 7),
+    ],
+)
+def test_stream_decipher(init, pt, size):
+    v = Vigenere(*init)
+    ct = v.encipher(pt)
+    chunks = [ct[i : i + size] for i in range(0, len(ct), size)]
+    assert "".join(v.stream_decipher(chunks)) == v.decipher(ct)
+
+
+@pytest.mark.parametrize(
+    "init, pt, block_size",
+    [
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.\n", 1 << 20),
+        (["lemon"], "the quick brown fox jumps over 3 lazy dogs.\n" * 50, 16),
+        (["key"], "Ünïcödé split across blocks: ÀÉÎÕÜ.\n" * 10, 5),
+        (["lemon"], "", 16),
+        (["ΒΓ", "ΑΒΓΔ"], "the quick brown fox jumps over 3 lazy dogs.\n", 16),
+    ],
+)
+def test_file(tmp_path, monkeypatch, init, pt, block_size):
+    monkeypatch.setattr(cipher_machine, "_FILE_BLOCK_SIZE", block_size)
+    v = Vigenere(*init)
+    src, ct_path, pt_path = (tmp_path / name for name in ("src", "ct", "pt"))
+    src.write_text(pt, encoding="utf-8")
+
+    v.encipher_file(src, ct_path)
+    ct = ct_path.read_text(encoding="utf-8")
+    assert ct == v.encipher(pt)
+
+    v.decipher_file(ct_path, pt_path)
+    assert pt_path.read_text(encoding="utf-8") == v.decipher(ct)
+
+
+@pytest.mark.parametrize(
+    "init, pt, bytes_type",
+    [
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", bytes),
+        (["lemon"], "the quick brown fox jumps over 3 lazy dogs.", bytearray),
+        (["key"], "the quick brown fox jumps over 3 lazy dogs.", memoryview),
+        (["lemon"], "a+b=c <tab>\there $5 ~~~", bytes),
+        (["key"], "", bytes),
+    ],
+)
+def test_bytes(init, pt, bytes_type):
+    v = Vigenere(*init)
+    ct = v.encipher(bytes_type(pt.encode("ascii")))
+    assert type(ct) is bytes_type
+    assert bytes(ct) == v.encipher(pt).encode("ascii")
+
+    dec = v.decipher(ct)
+    assert type(dec) is bytes_type
+    assert bytes(dec) == v.decipher(v.encipher(pt)).encode("ascii")
+
+
+@pytest.mark.parametrize(
+    "init, texts, workers",
+    [
+        (
+            ["key"],
+            ["the quick brown fox", "jumps over 3", "", "lazy dogs."],
+            None,
+        ),
+        (
+            ["lemon"],
+            ["the quick brown fox", "jumps over 3", "", "lazy dogs."],
+            2,
+        ),
+        (["key"], ["null \x00 separated", "text"], None),
+    ],
+)
+def test_many(init, texts, workers):
+    v = Vigenere(*init)
+    cts = v.encipher_many(texts, workers)
+    assert cts == [v.encipher(text) for text in texts]
+    assert v.decipher_many(cts, workers) == [v.decipher(ct) for ct in cts]
+
+
+@pytest.mark.parametrize(
+    "init, pt",
+    [
+        (["key"], "the quick brown fox jumps over 3 lazy dogs."),
+        (["lemon"], "Ünïcödé 𝄞 and $12 " * 300),
+        (["key"], ""),
+    ],
+)
+def test_numpy_engine(init, pt):
+    pytest.importorskip("numpy")
+    v = Vigenere(*init)
+    ct, dec = v.encipher(pt), v.decipher(v.encipher(pt))
+    v.set_engine("numpy")
+    assert v.encipher(pt) == ct
+    assert v.decipher(ct) == dec
+    assert "".join(v.stream_encipher([pt[:5], pt[5:]])) == ct
+
+
+@pytest.mark.parametrize(
+    "init, pt",
+    [
+        (["key"], "the quick brown fox jumps over 3 lazy dogs. " * 20),
+        (["key"], "thequickbrownfoxjumpsoverthelazydog" * 20),
+        (["ΒΓ", "ΑΒΓΔ"], "ΑΒΓΔ ab ΔΔ𝄞 " * 20),
+        (["key"], "!?" * 100),
+    ],
+)
+def test_strided(monkeypatch, init, pt):
+    v = Vigenere(*init)
+    monkeypatch.setattr(vigenere, "_STRIDED_MIN_LENGTH", len(pt) + 1)
+    ct, dec = v.encipher(pt), v.decipher(v.encipher(pt))
+    monkeypatch.setattr(vigenere, "_STRIDED_MIN_LENGTH", 0)
+    assert v.encipher(pt) == ct
+    assert v.decipher(ct) == dec
+    assert "".join(v.stream_encipher([pt[:7], pt[7:]])) == ct
+
+
+@pytest.fixture
+def crack_pt(lighthouse_pt):
+    return lighthouse_pt + (
+        " The people of the town said that ships all along the coast steered"
+        " by his lamp, and that no vessel had been lost on the rocks below"
+        " since he first took up the post."
+    )
+
+
+@pytest.mark.parametrize("key", ["lemon", "k", "cryptography", "abcab"])
+def test_crack(key, crack_pt):
+    ct = Vigenere(key).encipher(crack_pt)
+    ranked, v = Vigenere.crack(ct)
+    assert ranked[0][0] == v.key()
+    assert v.decipher(ct) == Vigenere(key).decipher(ct)
+    assert [score for _, score in ranked] == sorted(
+        (score for _, score in ranked), reverse=True
+    )
+
+
+def test_crack_long(crack_pt):
+    ct = Vigenere("zebras").encipher(crack_pt * 300)
+    ranked, v = Vigenere.crack(ct, max_period=12)
+    assert v.key() == "ZEBRAS"